@@ -12,104 +12,348 @@ Format:
 Each edit block starts with a file path, then old text between <<< and >>>,
 then new text between >>> and ===.
 
+The spec is parsed as a stream and applied, in spec order, to in-memory file
+contents. Each file is read once and written once after the whole spec parses
+(temp file + os.replace: readers never see a half-written file).
+
+Consecutive edits to the same file form a run. A run whose old texts each
+occur exactly once, without overlap, in the file as it was before the run, and
+gain no occurrence from an earlier edit's new text, is applied in one pass;
+other runs are applied edit by edit, so an edit may target text produced by an
+earlier one. Either way the result equals applying the edits one by one.
+
 Usage:
-    batch-edit.py edits.txt
-    batch-edit.py < edits.txt
+    batch-edit.py [--atomic] edits.txt
+    batch-edit.py [--atomic] < edits.txt
+
+--atomic: all-or-nothing. Every edit is validated before any file is written;
+a single error leaves the tree untouched.
 """
 
+import bisect
+import itertools
+import os
+import shutil
 import sys
+import tempfile
 from pathlib import Path
 
+# Runs of at least this many consecutive edits to one file build a line index
+INDEX_MIN_EDITS = 16
+# Runs with more edits than this within one old text's reach of each other
+# are applied edit by edit
+MAX_CLUSTER_EDITS = 64
+
+
+def _collect_until(lines, marker):
+    """Consume lines up to a marker line; return them, or None at EOF."""
+    collected = []
+    for line in lines:
+        if line.strip() == marker:
+            return collected
+        collected.append(line)
+    return None
+
+
+def parse_edits(lines):
+    """Parse marker-format edit specifications incrementally.
 
-def parse_edits(content):
-    """Parse marker-format edit specifications.
+    lines: iterable of text lines (file object, sys.stdin, list); trailing
+    newlines are ignored. Each block is yielded as soon as its '===' is read,
+    so only the current block is held in memory.
 
     Yields (filepath, old_text, new_text) tuples.
     """
-    lines = content.split('\n')
-    i = 0
-    n = len(lines)
+    lines = (line[:-1] if line.endswith('\n') else line for line in lines)
 
-    while i < n:
+    for line in lines:
         # Skip empty lines
-        while i < n and not lines[i].strip():
-            i += 1
-        if i >= n:
-            break
+        if not line.strip():
+            continue
 
         # File path
-        filepath = lines[i].strip()
-        i += 1
+        filepath = line.strip()
 
         # Expect <<<
-        while i < n and not lines[i].strip():
-            i += 1
-        if i >= n or lines[i].strip() != '<<<':
-            raise ValueError(f"Expected '<<<' after filepath '{filepath}', got '{lines[i] if i < n else 'EOF'}'")
-        i += 1
+        marker = next((line for line in lines if line.strip()), None)
+        if marker is None or marker.strip() != '<<<':
+            raise ValueError(f"Expected '<<<' after filepath '{filepath}', got '{marker if marker is not None else 'EOF'}'")
 
         # Collect old text until >>>
-        old_lines = []
-        while i < n and lines[i].strip() != '>>>':
-            old_lines.append(lines[i])
-            i += 1
-        if i >= n:
+        old_lines = _collect_until(lines, '>>>')
+        if old_lines is None:
             raise ValueError(f"Expected '>>>' to end old text for '{filepath}'")
-        old_text = '\n'.join(old_lines)
-        i += 1
 
         # Collect new text until ===
-        new_lines = []
-        while i < n and lines[i].strip() != '===':
-            new_lines.append(lines[i])
-            i += 1
-        if i >= n:
+        new_lines = _collect_until(lines, '===')
+        if new_lines is None:
             raise ValueError(f"Expected '===' to end new text for '{filepath}'")
-        new_text = '\n'.join(new_lines)
-        i += 1
-
-        yield filepath, old_text, new_text
 
+        yield filepath, '\n'.join(old_lines), '\n'.join(new_lines)
 
-def apply_edit(filepath, old_text, new_text):
-    """Apply a single edit. Returns (success, message)."""
-    path = Path(filepath)
 
-    if not path.exists():
-        return False, f"File not found: {filepath}"
+def apply_edit(content, filepath, old_text, new_text):
+    """Apply a single edit to in-memory content.
 
-    content = path.read_text()
+    Returns (new_content, success, message); content is returned unchanged
+    on failure.
+    """
     count = content.count(old_text)
 
     if count == 0:
-        return False, f"No match found in {filepath}"
+        return content, False, f"No match found in {filepath}"
     if count > 1:
-        return False, f"Multiple matches ({count}) in {filepath}"
+        return content, False, f"Multiple matches ({count}) in {filepath}"
 
     new_content = content.replace(old_text, new_text, 1)
-    path.write_text(new_content)
-    return True, f"Applied edit to {filepath}"
+    return new_content, True, f"Applied edit to {filepath}"
+
+
+def build_line_index(content):
+    """Return the lines of content as a sorted list of (line, start offset)."""
+    index = []
+    start = 0
+    for line in content.split('\n'):
+        index.append((line, start))
+        start += len(line) + 1
+    index.sort()
+    return index
+
+
+def find_occurrences(content, index, old_text, limit=2):
+    """Return start offsets of old_text in content, stopping at limit (None: all).
+
+    Every occurrence of a multi-line old text puts the text after its first
+    newline (the anchor) at the start of a line that begins with the anchor.
+    With a line index those lines are one bisect away, and each candidate is
+    confirmed with startswith. Single-line old texts, old texts with an empty
+    anchor (it would match every line), and runs without an index use
+    str.find.
+    """
+    nl = old_text.find('\n')
+    end = old_text.find('\n', nl + 1) if nl != -1 else -1
+    anchor = old_text[nl + 1 :] if end == -1 else old_text[nl + 1 : end]
+    hits = []
+    if index is not None and nl != -1 and anchor:
+        i = bisect.bisect_left(index, (anchor,))
+        while i < len(index) and index[i][0].startswith(anchor):
+            start = index[i][1] - nl - 1
+            if start >= 0 and content.startswith(old_text, start):
+                hits.append(start)
+                if len(hits) == limit:
+                    break
+            i += 1
+        return sorted(hits)
+
+    start = content.find(old_text)
+    while start != -1:
+        hits.append(start)
+        if len(hits) == limit:
+            break
+        start = content.find(old_text, start + 1)
+    return hits
+
+
+def gains_occurrence(content, run, spans, use_index):
+    """Return True if an edit's old text would gain a match from earlier edits.
+
+    Applied one by one, edit k sees the new texts of edits 0..k-1; its old
+    text must then still occur exactly once. spans are (start, end, new_text,
+    edit number) in content, sorted and disjoint. Occurrences that touch no
+    replaced span are original text, so only text near replaced spans is
+    searched: spans closer than the longest old text form a cluster, and each
+    cluster is rendered once per prefix of its edits (in edit order) that has
+    been applied. Every old text is then searched in the rendered windows
+    valid for it. Also True, without checking, for clusters of more than
+    MAX_CLUSTER_EDITS edits and for old texts containing '\0'.
+    """
+    reach = max(len(old_text) for _, old_text, _ in run) - 1
+    if any('\0' in old_text for _, old_text, _ in run):
+        return True  # '\0' separates windows below
+    clusters = []
+    for span in spans:
+        if clusters and span[0] - clusters[-1][-1][1] < reach:
+            clusters[-1].append(span)
+        else:
+            clusters.append([span])
+
+    # Windows: (offset in joined text, first edit, last edit, replaced ranges)
+    texts = []
+    windows = []
+    offset = 0
+    for cluster in clusters:
+        if len(cluster) > MAX_CLUSTER_EDITS:
+            return True
+        left = max(0, cluster[0][0] - reach)
+        right = cluster[-1][1] + reach
+        order = sorted(span[3] for span in cluster) + [len(run)]
+        for applied_last, valid_last in zip(order, order[1:]):
+            pieces = []
+            replaced = []
+            length = 0
+            prev = left
+            for start, end, new_text, number in cluster:
+                length += start - prev
+                pieces.append(content[prev:start])
+                if number <= applied_last:
+                    replaced.append((length, length + len(new_text)))
+                    pieces.append(new_text)
+                    length += len(new_text)
+                else:
+                    pieces.append(content[start:end])
+                    length += end - start
+                prev = end
+            pieces.append(content[prev:right])
+            text = ''.join(pieces)
+            texts.append(text)
+            windows.append((offset, applied_last + 1, valid_last, replaced))
+            offset += len(text) + 1
+
+    joined = '\0'.join(texts)
+    index = build_line_index(joined) if use_index else None
+    starts = [window[0] for window in windows]
+    for number, (_, old_text, _) in enumerate(run):
+        for hit in find_occurrences(joined, index, old_text, limit=None):
+            window_start, first, last, replaced = windows[
+                bisect.bisect_right(starts, hit) - 1
+            ]
+            if not first <= number <= last:
+                continue
+            start = hit - window_start
+            end = start + len(old_text)
+            for a, b in replaced:
+                if (start < b and end > a) if a < b else start < a < end:
+                    return True
+    return False
+
+
+def apply_run(content, run):
+    """Apply a run of edits to one file in a single pass, or return None.
+
+    Every old text is located in content as it was before the run (through a
+    line index for runs of INDEX_MIN_EDITS or more). Applies only when each
+    occurs exactly once, no two matches overlap, and no old text gains a match
+    from an earlier edit's new text (see gains_occurrence), i.e. when the
+    result equals applying the run edit by edit. Otherwise returns None and
+    the caller applies the run sequentially, which resolves edits that target
+    text produced by earlier edits and reports ambiguity edit by edit.
+    """
+    use_index = len(run) >= INDEX_MIN_EDITS
+    index = build_line_index(content) if use_index else None
+    spans = []
+    for number, (_, old_text, new_text) in enumerate(run):
+        hits = find_occurrences(content, index, old_text) if old_text else []
+        if len(hits) != 1:
+            return None
+        spans.append((hits[0], hits[0] + len(old_text), new_text, number))
+
+    spans.sort(key=lambda span: span[0])
+    pieces = []
+    prev = 0
+    for start, end, new_text, _ in spans:
+        if start < prev:
+            return None  # overlapping matches: result depends on edit order
+        pieces.append(content[prev:start])
+        pieces.append(new_text)
+        prev = end
+    pieces.append(content[prev:])
+    if gains_occurrence(content, run, spans, use_index):
+        return None
+    return ''.join(pieces)
+
+
+def write_atomic(path, content):
+    """Write content via a sibling temp file and os.replace (keeps file mode)."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+        shutil.copymode(path, tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def apply_edits(edits):
+    """Apply a stream of edits to in-memory file contents.
+
+    Edits are consumed as the parser yields them, one run of consecutive
+    edits to the same file at a time, and applied to that file's pending
+    content (read on first use) in spec order; the spec itself is never held
+    in memory. A run is applied in one pass via apply_run() when its matches
+    are unambiguous in the file as it was before the run.
+
+    Returns (pending, results): pending maps resolved path to new content for
+    files with at least one applied edit; results are (success, message) in
+    spec order.
+    """
+    contents = {}  # resolved path -> current content, None if missing
+    changed = set()
+    results = []
+    runs = itertools.groupby(edits, key=lambda edit: Path(edit[0]).resolve())
+    for path, run in runs:
+        run = list(run)
+        if path not in contents:
+            contents[path] = path.read_text() if path.exists() else None
+        if contents[path] is None:
+            results.extend(
+                (False, f"File not found: {filepath}") for filepath, _, _ in run
+            )
+            continue
+
+        if len(run) > 1:
+            new_content = apply_run(contents[path], run)
+            if new_content is not None:
+                contents[path] = new_content
+                changed.add(path)
+                results.extend(
+                    (True, f"Applied edit to {filepath}") for filepath, _, _ in run
+                )
+                continue
+
+        for filepath, old_text, new_text in run:
+            contents[path], success, message = apply_edit(
+                contents[path], filepath, old_text, new_text
+            )
+            if success:
+                changed.add(path)
+            results.append((success, message))
+    return {path: contents[path] for path in contents if path in changed}, results
 
 
 def main():
-    if len(sys.argv) > 1:
-        content = Path(sys.argv[1]).read_text()
+    args = sys.argv[1:]
+    atomic = '--atomic' in args
+    args = [arg for arg in args if arg != '--atomic']
+
+    # Stream the spec; files are written only after the last block parses,
+    # so a malformed block aborts before any write
+    if args:
+        with open(args[0]) as spec:
+            pending, results = apply_edits(parse_edits(spec))
     else:
-        content = sys.stdin.read()
+        pending, results = apply_edits(parse_edits(sys.stdin))
 
-    success_count = 0
-    error_count = 0
+    success_count = sum(1 for success, _ in results if success)
+    error_count = len(results) - success_count
 
-    for filepath, old_text, new_text in parse_edits(content):
-        success, message = apply_edit(filepath, old_text, new_text)
-        if success:
-            print(f"  {message}")
-            success_count += 1
-        else:
+    if atomic and error_count:
+        pending = {}
+        success_count = 0
+    for path, new_content in pending.items():
+        write_atomic(path, new_content)
+
+    for success, message in results:
+        if not success:
             print(f"  ERROR: {message}", file=sys.stderr)
-            error_count += 1
+        elif not atomic or not error_count:
+            print(f"  {message}")
 
-    print(f"\n{success_count} edits applied, {error_count} errors")
+    summary = f"\n{success_count} edits applied, {error_count} errors"
+    if atomic and error_count:
+        summary += " (--atomic: no files written)"
+    print(summary)
     sys.exit(1 if error_count else 0)
 
 
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Compile plugin skills, agents and fragments into one JSON index.
+
+Usage:
+    compile-manifest.py [plugin-root]
+
+Default plugin root: parent of this script's directory.
+
+Output: <plugin-root>/.edify-manifest.json
+    skills     name, path, description, cooperative, default-exit
+    agents     name, path, description, model, mtime_ns, body
+    fragments  name, path
+
+Two consumers load the manifest with a single read instead of rediscovering
+and re-parsing markdown:
+- hooks/userpromptsubmit-shortcuts.py — continuation registry, used while
+  "skills_stamp" matches the skills tree (root, each skill directory and its
+  SKILL.md; see skills_stamp)
+- bin/prepare-runbook.py — baseline agent bodies, used while an agent's
+  "mtime_ns" matches its file
+
+Other readers (plugin resolution, skill and fragment lookups elsewhere) still
+read their sources directly. Stale or missing manifests are ignored by
+consumers, so refreshing is an optimization. Refreshed by sync-hooks-config.py
+and `just manifest`.
+"""
+
+import glob
+import json
+import os
+import sys
+from pathlib import Path
+
+MANIFEST_NAME = ".edify-manifest.json"
+MANIFEST_VERSION = 2
+
+
+def _stamp(path: Path) -> list[int] | None:
+    """Return [mtime_ns, inode] for path, or None if missing."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_ino]
+
+
+def skills_stamp(root: Path) -> list | None:
+    """Return the change stamp of a skills directory, or None if missing.
+
+    Must match _skills_stamp in the shortcuts hook: the root's stamp plus
+    [name, directory stamp, SKILL.md stamp] for each skill directory.
+    """
+    root_stamp = _stamp(root)
+    if root_stamp is None:
+        return None
+    try:
+        names = sorted(entry.name for entry in os.scandir(root) if entry.is_dir())
+    except OSError:
+        return None
+    skills = [
+        [name, _stamp(root / name), _stamp(root / name / "SKILL.md")] for name in names
+    ]
+    return [root_stamp, *skills]
+
+
+def read_frontmatter(content: str) -> dict:
+    """Parse YAML frontmatter; empty dict if absent or malformed.
+
+    Matches the shortcuts hook: frontmatter opens with '---' on the first line
+    and closes at the next line consisting of '---'. PyYAML is imported here,
+    not at module level: sync-hooks-config.py loads this module.
+    """
+    import yaml
+
+    if not content.startswith("---\n"):
+        return {}
+    end = content.find("\n---\n", 4)
+    if end == -1:
+        return {}
+    try:
+        data = yaml.safe_load(content[4:end])
+    except yaml.YAMLError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def agent_body(content: str) -> str:
+    """Return agent body exactly as prepare-runbook's parse_frontmatter does."""
+    if not content.startswith("---"):
+        return content
+    try:
+        end_idx = content.index("---", 3)
+    except ValueError:
+        return content
+    return content[end_idx + 3 :].lstrip()
+
+
+def compile_skills(plugin_root: Path) -> list[dict]:
+    """Index SKILL.md files in glob order (registry precedence)."""
+    skills = []
+    pattern = str(plugin_root / "skills" / "**" / "SKILL.md")
+    for path_str in glob.glob(pattern, recursive=True):
+        path = Path(path_str)
+        try:
+            frontmatter = read_frontmatter(path.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError):
+            frontmatter = {}
+        continuation = frontmatter.get("continuation") or {}
+        skills.append(
+            {
+                "name": frontmatter.get("name") or path.parent.name,
+                "path": str(path.relative_to(plugin_root)),
+                "description": frontmatter.get("description", ""),
+                "cooperative": bool(continuation.get("cooperative")),
+                "default-exit": continuation.get("default-exit", []),
+            }
+        )
+    return skills
+
+
+def compile_agents(plugin_root: Path) -> list[dict]:
+    """Index agent definitions with frontmatter-stripped bodies."""
+    agents = []
+    for path in sorted((plugin_root / "agents").glob("*.md")):
+        content = path.read_text()
+        frontmatter = read_frontmatter(content)
+        agents.append(
+            {
+                "name": frontmatter.get("name") or path.stem,
+                "path": str(path.relative_to(plugin_root)),
+                "description": frontmatter.get("description", ""),
+                "model": frontmatter.get("model", ""),
+                "mtime_ns": path.stat().st_mtime_ns,
+                "body": agent_body(content),
+            }
+        )
+    return agents
+
+
+def compile_fragments(plugin_root: Path) -> list[dict]:
+    """Index instruction fragments."""
+    return [
+        {"name": path.stem, "path": str(path.relative_to(plugin_root))}
+        for path in sorted((plugin_root / "fragments").glob("*.md"))
+    ]
+
+
+def compile_manifest(plugin_root: Path) -> dict:
+    """Build the manifest dict for a plugin root."""
+    return {
+        "version": MANIFEST_VERSION,
+        "skills_stamp": skills_stamp(plugin_root / "skills"),
+        "skills": compile_skills(plugin_root),
+        "agents": compile_agents(plugin_root),
+        "fragments": compile_fragments(plugin_root),
+    }
+
+
+def write_manifest(plugin_root: Path) -> Path:
+    """Compile and atomically write <plugin_root>/.edify-manifest.json."""
+    manifest_path = plugin_root / MANIFEST_NAME
+    tmp_path = manifest_path.with_name(f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+    manifest = compile_manifest(plugin_root)
+    tmp_path.write_text(json.dumps(manifest, indent=1, default=str) + "\n")
+    tmp_path.replace(manifest_path)
+    return manifest_path
+
+
+def main() -> None:
+    if len(sys.argv) > 2:
+        print("Usage: compile-manifest.py [plugin-root]", file=sys.stderr)
+        sys.exit(1)
+    if len(sys.argv) == 2:
+        plugin_root = Path(sys.argv[1])
+    else:
+        plugin_root = Path(__file__).resolve().parent.parent
+
+    if not (plugin_root / "skills").is_dir():
+        print(f"Error: no skills/ directory under {plugin_root}", file=sys.stderr)
+        sys.exit(1)
+
+    manifest_path = write_manifest(plugin_root)
+    print(f"✓ Wrote {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,60 @@
 #!/usr/bin/env python3
 """Deliverable inventory: diff merge-base→HEAD, classify files, report counts.
 
-Usage: deliverable-inventory.py [plan-name]
+Usage: deliverable-inventory.py [plan-name] [--format markdown|json]
 
 Excludes plan artifacts (plans/, session.md, learnings.md, plan-archive.md, tmp/).
 Handles submodule diffs by resolving submodule pointer at merge base.
-Outputs markdown table to stdout.
+Outputs markdown tables (default) or JSON to stdout.
+
+Exclusions and file types come from a rule table (RULES below), overridable per
+project under `inventory:` in .edify.yaml.
+
+Git invocations are bounded: merge-base, one --raw/--numstat diff of the parent
+(submodule pointers come from its gitlink entries), and one numstat per changed
+submodule, run concurrently.
 """
 
+import argparse
+import fnmatch
+import functools
+import json
+import re
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-EXCLUDE = {"agents/session.md", "agents/plan-archive.md", "agents/learnings.md"}
+# Default rule table. A project overrides any key in .edify.yaml:
+#
+#   inventory:
+#     exclude: [agents/session.md]     # exact paths
+#     exclude_prefixes: [plans/]       # directory prefixes
+#     rules:                           # first match wins
+#       - {type: Test, name: ["test_*.py"]}
+#       - {type: Agentic prose, name: ["*.md"], dir: [skills/]}
+#     default: Configuration
+#
+# `name` globs match the file name; `dir` entries match as substrings of the
+# lowercased directory path (with trailing "/").
+EXCLUDE = ("agents/session.md", "agents/plan-archive.md", "agents/learnings.md")
 EXCLUDE_PREFIXES = ("plans/", "tmp/")
+RULES = (
+    {"type": "Test", "name": ["test_*.py"]},
+    {"type": "Code", "name": ["*.py", "*.sh"]},
+    {"type": "Agentic prose", "name": ["SKILL.md"]},
+    {
+        "type": "Agentic prose",
+        "name": ["*.md"],
+        "dir": ["skills/", "agents/", "fragments/"],
+    },
+    {"type": "Human docs", "name": ["*.md"]},
+)
+DEFAULT_TYPE = "Configuration"
+TYPE_ORDER = ("Code", "Test", "Agentic prose", "Human docs", "Configuration")
+CONFIG_FILE = ".edify.yaml"
+GITLINK_MODE = "160000"
+MAX_SUBMODULE_WORKERS = 8
 
 
 def run(cmd: str, cwd: str | None = None) -> str:
@@ -23,24 +64,166 @@ def run(cmd: str, cwd: str | None = None) -> str:
     return r.stdout.strip()
 
 
-def classify(path: str) -> str:
-    name = Path(path).name
-    if name.startswith("test_") and name.endswith(".py"):
-        return "Test"
-    if name.endswith((".py", ".sh")):
-        return "Code"
-    if name == "SKILL.md":
-        return "Agentic prose"
-    if name.endswith(".md"):
-        parts = path.lower()
-        if any(d in parts for d in ("skills/", "agents/", "fragments/")):
-            return "Agentic prose"
-        return "Human docs"
-    if name in ("justfile", "Justfile", "pyproject.toml") or name.endswith(
-        (".toml", ".json", ".cfg")
-    ):
-        return "Configuration"
-    return "Configuration"
+def _is_str_list(value) -> bool:
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+
+def _config_error(message: str) -> None:
+    print(f"ERROR: {CONFIG_FILE} inventory: {message}", file=sys.stderr)
+    sys.exit(1)
+
+
+def validate_inventory(section) -> None:
+    """Exit 1 unless section has the shape documented above RULES.
+
+    Globs and paths must be lists of strings: a bare string would otherwise
+    be iterated (and fnmatch-translated) character by character.
+    """
+    if not isinstance(section, dict):
+        _config_error("expected a mapping")
+    for key in ("exclude", "exclude_prefixes"):
+        if key in section and not _is_str_list(section[key]):
+            _config_error(f"{key} must be a list of strings")
+    if "default" in section and not isinstance(section["default"], str):
+        _config_error("default must be a string")
+    rules = section.get("rules", [])
+    if not isinstance(rules, list):
+        _config_error("rules must be a list")
+    for rule in rules:
+        if not isinstance(rule, dict) or not isinstance(rule.get("type"), str):
+            _config_error("rules entries need a type string")
+        if not _is_str_list(rule.get("name")) or not rule["name"]:
+            _config_error("rules entries need a non-empty name list of strings")
+        if "dir" in rule and not _is_str_list(rule["dir"]):
+            _config_error("rules dir must be a list of strings")
+
+
+def load_config(project_dir: Path) -> dict:
+    """Return inventory rules: defaults updated from .edify.yaml `inventory`.
+
+    PyYAML is imported only when the file has a top-level `inventory:` key;
+    without PyYAML the defaults apply (with a warning).
+    """
+    config = {
+        "exclude": EXCLUDE,
+        "exclude_prefixes": EXCLUDE_PREFIXES,
+        "rules": RULES,
+        "default": DEFAULT_TYPE,
+    }
+    config_path = project_dir / CONFIG_FILE
+    if not config_path.is_file():
+        return config
+    try:
+        text = config_path.read_text()
+    except OSError as e:
+        print(f"ERROR: Cannot read {CONFIG_FILE}: {e}", file=sys.stderr)
+        sys.exit(1)
+    if not re.search(r"^inventory\s*:", text, re.MULTILINE):
+        return config
+    try:
+        import yaml
+    except ImportError:
+        print(
+            f"WARNING: PyYAML not installed; ignoring {CONFIG_FILE} inventory",
+            file=sys.stderr,
+        )
+        return config
+
+    try:
+        data = yaml.safe_load(text)
+    except yaml.YAMLError as e:
+        print(f"ERROR: Cannot read {CONFIG_FILE}: {e}", file=sys.stderr)
+        sys.exit(1)
+    section = data.get("inventory") if isinstance(data, dict) else None
+    if section is None:
+        return config
+    validate_inventory(section)
+    config.update({key: section[key] for key in config if key in section})
+    return config
+
+
+def build_classifier(rules, default: str):
+    """Compile rules into a path → type function, memoized per directory.
+
+    A rule's `dir` condition depends only on the directory, so each distinct
+    directory resolves once to a combined file-name regex holding one named
+    alternative per applicable rule, in rule order: the first alternative
+    that matches is the first matching rule.
+    """
+
+    @functools.cache
+    def name_pattern(indices: tuple[int, ...]) -> re.Pattern | None:
+        if not indices:
+            return None
+        return re.compile(
+            "|".join(
+                f"(?P<r{i}>{'|'.join(map(fnmatch.translate, rules[i]['name']))})"
+                for i in indices
+            )
+        )
+
+    @functools.cache
+    def directory_pattern(directory: str) -> re.Pattern | None:
+        lowered = directory.lower()
+        return name_pattern(
+            tuple(
+                i
+                for i, rule in enumerate(rules)
+                if not rule.get("dir")
+                or any(d.lower() in lowered for d in rule["dir"])
+            )
+        )
+
+    def classify(path: str) -> str:
+        directory, _, name = path.rpartition("/")
+        pattern = directory_pattern(f"{directory}/" if directory else "")
+        m = pattern.match(name) if pattern else None
+        return rules[int(m.lastgroup[1:])]["type"] if m else default
+
+    return classify
+
+
+def build_exclusion(exact, prefixes):
+    """Compile exclusions into a path → bool function.
+
+    Directory prefixes form a trie of path components; the verdict per
+    directory is memoized, leaving one set lookup per file.
+    """
+    trie: dict = {}
+    for prefix in prefixes:
+        node = trie
+        for part in prefix.strip("/").split("/"):
+            node = node.setdefault(part, {})
+        node[""] = True  # terminal: everything below is excluded
+    exact_paths = frozenset(exact)
+
+    @functools.cache
+    def directory_excluded(directory: str) -> bool:
+        node = trie
+        for part in directory.split("/"):
+            node = node.get(part)
+            if node is None:
+                return False
+            if "" in node:
+                return True
+        return False
+
+    def excluded(path: str) -> bool:
+        if path in exact_paths:
+            return True
+        directory = path.rpartition("/")[0]
+        return bool(directory) and directory_excluded(directory)
+
+    return excluded
+
+
+def parse_numstat_line(line: str) -> tuple[int, int, str] | None:
+    """Parse one git diff --numstat line into (plus, minus, path)."""
+    parts = line.split("\t", 2)
+    if len(parts) != 3:
+        return None
+    p, m, f = parts
+    return (int(p) if p != "-" else 0, int(m) if m != "-" else 0, f)
 
 
 def numstat(
@@ -50,55 +233,80 @@ def numstat(
     out = run(f"git diff {base}..{head} --numstat --diff-filter=ACMR", cwd=cwd)
     results = []
     for line in out.splitlines():
-        parts = line.split("\t", 2)
-        if len(parts) != 3:
-            continue
-        p, m, f = parts
-        results.append((int(p) if p != "-" else 0, int(m) if m != "-" else 0, f))
+        entry = parse_numstat_line(line)
+        if entry:
+            results.append(entry)
     return results
 
 
-def submodule_paths() -> list[str]:
-    out = run("git config --file .gitmodules --get-regexp 'submodule\\..*\\.path'")
-    return [line.split()[-1] for line in out.splitlines() if line]
-
-
-def submodule_commit(tree: str, path: str) -> str | None:
-    out = run(f"git ls-tree {tree} {path}")
-    parts = out.split()
-    return parts[2] if len(parts) >= 3 else None
-
-
-def excluded(path: str) -> bool:
-    return path in EXCLUDE or any(path.startswith(p) for p in EXCLUDE_PREFIXES)
+def parent_diff(
+    base: str,
+) -> tuple[list[tuple[int, int, str]], list[tuple[str, str, str]]]:
+    """Diff base..HEAD once; return (numstat entries, changed submodules).
 
+    --raw lines (prefixed ":") carry file modes and object ids. Every gitlink
+    path (new mode 160000) is dropped from the numstat entries. Gitlinks on
+    both sides give each changed submodule as (path, base commit, head
+    commit); a submodule added since base has no base commit and is skipped,
+    as are its files.
+    """
+    out = run(f"git diff {base}..HEAD --raw --numstat --no-abbrev --diff-filter=ACMR")
+    entries = []
+    submodules = []
+    gitlinks = set()
+    for line in out.splitlines():
+        if line.startswith(":"):
+            meta, _, path = line.partition("\t")
+            old_mode, new_mode, old_id, new_id, _ = meta[1:].split(" ", 4)
+            if new_mode == GITLINK_MODE:
+                gitlinks.add(path)
+                if old_mode == GITLINK_MODE:
+                    submodules.append((path, old_id, new_id))
+            continue
+        entry = parse_numstat_line(line)
+        if entry:
+            entries.append(entry)
+    return [e for e in entries if e[2] not in gitlinks], submodules
 
-def main() -> None:
-    merge_base = run("git merge-base HEAD main")
-    if not merge_base:
-        print("ERROR: Cannot find merge base with main", file=sys.stderr)
-        sys.exit(1)
 
-    submods = submodule_paths()
+def collect_entries(
+    merge_base: str, classify, excluded
+) -> list[tuple[str, str, int, int]]:
+    """Return (type, path, plus, minus) for parent and submodule changes."""
+    parent_entries, submodules = parent_diff(merge_base)
 
     # Parent repo files
     entries: list[tuple[str, str, int, int]] = []
-    for plus, minus, path in numstat(merge_base):
-        if path in submods or excluded(path):
+    for plus, minus, path in parent_entries:
+        if excluded(path):
             continue
         entries.append((classify(path), path, plus, minus))
 
-    # Submodule files
-    for sm in submods:
-        base_c = submodule_commit(merge_base, sm)
-        head_c = submodule_commit("HEAD", sm)
-        if not base_c or not head_c or base_c == head_c:
-            continue
-        for plus, minus, path in numstat(base_c, head_c, cwd=sm):
-            display = f"{sm}/{path}"
-            if not excluded(display):
-                entries.append((classify(display), display, plus, minus))
+    # Submodule files (independent repositories: diffed concurrently)
+    workers = min(MAX_SUBMODULE_WORKERS, len(submodules)) or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(lambda sm: numstat(sm[1], sm[2], cwd=sm[0]), submodules)
+        for (sm, _, _), sm_entries in zip(submodules, results, strict=True):
+            for plus, minus, path in sm_entries:
+                display = f"{sm}/{path}"
+                if not excluded(display):
+                    entries.append((classify(display), display, plus, minus))
+    return entries
+
+
+def summarize(entries: list[tuple[str, str, int, int]]) -> dict[str, list[int]]:
+    """Return {type: [files, plus, minus]}: TYPE_ORDER, then custom types."""
+    totals: dict[str, list[int]] = {}
+    for typ, _, plus, minus in entries:
+        t = totals.setdefault(typ, [0, 0, 0])
+        t[0] += 1
+        t[1] += plus
+        t[2] += minus
+    order = TYPE_ORDER + tuple(typ for typ in totals if typ not in TYPE_ORDER)
+    return {typ: totals[typ] for typ in order if typ in totals}
 
+
+def print_markdown(merge_base: str, entries: list[tuple[str, str, int, int]]) -> None:
     # Print per-file table
     print("## Deliverable Inventory\n")
     print(f"**Merge base:** `{merge_base[:8]}`\n")
@@ -108,21 +316,11 @@ def main() -> None:
         print(f"| {typ} | {path} | +{plus} | -{minus} |")
 
     # Summarize by type
-    totals: dict[str, list[int]] = {}
-    for typ, _, plus, minus in entries:
-        t = totals.setdefault(typ, [0, 0, 0])
-        t[0] += 1
-        t[1] += plus
-        t[2] += minus
-
     print("\n### Summary by Type\n")
     print("| Type | Files | + | - | Net |")
     print("|------|-------|---|---|-----|")
     grand = [0, 0, 0]
-    for typ in ("Code", "Test", "Agentic prose", "Human docs", "Configuration"):
-        if typ not in totals:
-            continue
-        fc, p, m = totals[typ]
+    for typ, (fc, p, m) in summarize(entries).items():
         print(f"| {typ} | {fc} | +{p} | -{m} | {p - m:+d} |")
         grand[0] += fc
         grand[1] += p
@@ -132,5 +330,51 @@ def main() -> None:
     )
 
 
+def print_json(merge_base: str, entries: list[tuple[str, str, int, int]]) -> None:
+    totals = summarize(entries)
+    grand = [sum(t[i] for t in totals.values()) for i in range(3)]
+    report = {
+        "merge_base": merge_base,
+        "files": [
+            {"type": typ, "path": path, "plus": plus, "minus": minus}
+            for typ, path, plus, minus in entries
+        ],
+        "summary": {
+            typ: {"files": fc, "plus": p, "minus": m, "net": p - m}
+            for typ, (fc, p, m) in totals.items()
+        },
+        "total": {
+            "files": grand[0],
+            "plus": grand[1],
+            "minus": grand[2],
+            "net": grand[1] - grand[2],
+        },
+    }
+    print(json.dumps(report, indent=2))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="deliverable-inventory")
+    parser.add_argument("plan_name", nargs="?", help="plan name (informational)")
+    parser.add_argument("--format", choices=("markdown", "json"), default="markdown")
+    args = parser.parse_args()
+
+    merge_base = run("git merge-base HEAD main")
+    if not merge_base:
+        print("ERROR: Cannot find merge base with main", file=sys.stderr)
+        sys.exit(1)
+
+    config = load_config(Path.cwd())
+    entries = collect_entries(
+        merge_base,
+        build_classifier(config["rules"], config["default"]),
+        build_exclusion(config["exclude"], config["exclude_prefixes"]),
+    )
+    if args.format == "json":
+        print_json(merge_base, entries)
+    else:
+        print_markdown(merge_base, entries)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""Compute session health checks for the SessionStart and Stop hooks.
+
+Usage:
+    health-snapshot.py [learnings-file]
+
+Default learnings file: $CLAUDE_PROJECT_DIR/agents/learnings.md
+
+The hooks manage the $TMPDIR/health-<session_id> flag themselves, before
+calling this script, so a failure here cannot repeat the report on every Stop.
+
+Checks, in one process:
+1. Dirty tree — `git status --porcelain`, always recomputed
+2. Learnings — learning-ages.py summary, reused while HEAD and the learnings
+   file are unchanged
+3. Stale worktrees — worktree HEADs read from .git/worktrees/* without
+   spawning git; commit times of new HEAD oids from one batched
+   `git log --no-walk` (per oid if the batch fails), reused per oid
+
+learning-ages.py is imported lazily: if it fails to load, the learnings check
+reports unavailable and worktrees are skipped, but the dirty-tree check runs.
+
+Reusable results live in tmp/health-snapshot.json.
+
+Output: one line with literal \\n separators, ready for the hooks'
+systemMessage JSON assembly. Exit: 0 (checks degrade to warnings).
+"""
+
+import functools
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SNAPSHOT_PATH = Path("tmp") / "health-snapshot.json"
+STALE_WORKTREE_DAYS = 7
+
+
+@functools.cache
+def load_learning_ages():
+    """Import bin/learning-ages.py (hyphenated filename); None if it fails."""
+    path = Path(__file__).resolve().parent / "learning-ages.py"
+    try:
+        spec = importlib.util.spec_from_file_location("learning_ages", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except Exception:
+        # Any import-time failure (missing file, syntax, dependency) only
+        # disables the checks that need the module
+        return None
+    return module
+
+
+def load_snapshot(root):
+    """Load tmp/health-snapshot.json (empty dict if missing/corrupt)."""
+    try:
+        with open(root / SNAPSHOT_PATH) as f:
+            snapshot = json.load(f)
+        return snapshot if isinstance(snapshot, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_snapshot(root, snapshot) -> None:
+    """Write tmp/health-snapshot.json; continue in degraded mode on failure."""
+    try:
+        snapshot_path = root / SNAPSHOT_PATH
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(snapshot_path, "w") as f:
+            json.dump(snapshot, f)
+    except OSError:
+        pass
+
+
+def check_dirty_tree() -> str:
+    """Health check 1 — dirty tree."""
+    result = subprocess.run(
+        ["git", "status", "--porcelain"], capture_output=True, text=True
+    )
+    dirty = [line for line in result.stdout.splitlines() if line]
+    if dirty:
+        return f"⚠️ Dirty tree ({len(dirty)} files)"
+    return "✓ Clean tree"
+
+
+def check_learnings(learnings_file, head, snapshot) -> str:
+    """Health check 2 — learnings summary, cached by HEAD and file stamp."""
+    try:
+        st = Path(learnings_file).stat()
+        stamp = [head, st.st_mtime_ns, st.st_size]
+    except OSError:
+        stamp = None
+
+    cached = snapshot.get("learnings") or {}
+    if head and stamp and cached.get("stamp") == stamp:
+        return cached["summary"]
+
+    learning_ages = load_learning_ages()
+    if learning_ages is None:
+        return "⚠️ Learnings status unavailable"
+    try:
+        _, entries, last_date, staleness = learning_ages.analyze_learnings(
+            str(learnings_file)
+        )
+        summary = learning_ages.format_summary(entries, last_date, staleness)
+    except (SystemExit, OSError):
+        # analyze_learnings exits 1 on a missing/empty file or git failure
+        return "⚠️ Learnings status unavailable"
+
+    if head and stamp:
+        snapshot["learnings"] = {"stamp": stamp, "summary": summary}
+    return summary
+
+
+def list_worktrees():
+    """Return [(path, head_oid)] from `git worktree list --porcelain`."""
+    result = subprocess.run(
+        ["git", "worktree", "list", "--porcelain"], capture_output=True, text=True
+    )
+    worktrees = []
+    path = None
+    for line in result.stdout.splitlines():
+        if line.startswith("worktree "):
+            path = line[len("worktree ") :]
+        elif line.startswith("HEAD ") and path is not None:
+            worktrees.append((path, line[len("HEAD ") :]))
+            path = None
+    return worktrees
+
+
+def read_worktrees(git_dir):
+    """Return [(path, head_oid)] by reading worktree admin dirs (no git spawn).
+
+    Main worktree first, then linked worktrees (<common>/worktrees/*) sorted
+    by path, as `git worktree list` orders them. Returns None when any HEAD
+    cannot be resolved; callers then fall back to list_worktrees().
+    """
+    learning_ages = load_learning_ages()
+    common_dir = git_dir
+    commondir_file = git_dir / "commondir"
+    try:
+        if commondir_file.is_file():
+            common_dir = (git_dir / commondir_file.read_text().strip()).resolve()
+        worktrees = []
+        if common_dir.name == ".git":
+            worktrees.append(
+                (str(common_dir.parent), learning_ages.read_head_oid(common_dir))
+            )
+        linked = []
+        admin_root = common_dir / "worktrees"
+        admin_dirs = sorted(admin_root.iterdir()) if admin_root.is_dir() else []
+        for admin_dir in admin_dirs:
+            gitdir = (admin_dir / "gitdir").read_text().strip()
+            path = (admin_dir / gitdir).resolve().parent
+            linked.append((str(path), learning_ages.read_head_oid(admin_dir)))
+        worktrees.extend(sorted(linked))
+    except OSError:
+        return None
+    if any(oid is None for _, oid in worktrees):
+        return None
+    return worktrees
+
+
+def _log_commit_times(oids) -> tuple[bool, dict[str, int]]:
+    """Run one `git log --no-walk` over oids; return (succeeded, {oid: time})."""
+    result = subprocess.run(
+        ["git", "log", "--no-walk=unsorted", "--format=%H %ct", *oids],
+        capture_output=True,
+        text=True,
+    )
+    times = {}
+    for line in result.stdout.splitlines():
+        oid, _, ct = line.partition(" ")
+        times[oid] = int(ct)
+    return result.returncode == 0, times
+
+
+def commit_times(oids, snapshot):
+    """Map commit oid → committer timestamp, batching the git calls.
+
+    Commit times never change for an oid, so known oids are served from the
+    snapshot. One unresolvable oid (e.g. an unborn HEAD) fails the whole
+    batch, so a failed batch is retried one oid at a time. Oids that still do
+    not resolve are left out of the result.
+    """
+    known = snapshot.setdefault("commit_times", {})
+    missing = sorted({oid for oid in oids if oid not in known})
+    if missing:
+        ok, times = _log_commit_times(missing)
+        if not ok:
+            times = {}
+            for oid in missing:
+                times.update(_log_commit_times([oid])[1])
+        known.update(times)
+    # Keep only oids still checked out somewhere
+    snapshot["commit_times"] = {oid: known[oid] for oid in oids if oid in known}
+    return dict(snapshot["commit_times"])
+
+
+def check_worktrees(root, git_dir, snapshot) -> str:
+    """Health check 3 — worktrees (other than this one) idle > 7 days.
+
+    HEADs are read from the filesystem and commit times are cached per oid,
+    so an unchanged set of worktrees costs no git process at all. Worktrees
+    whose HEAD does not resolve to a commit are not reported.
+    """
+    all_worktrees = read_worktrees(git_dir)
+    if all_worktrees is None:
+        all_worktrees = list_worktrees()
+    worktrees = [
+        (path, oid) for path, oid in all_worktrees if Path(path).resolve() != root
+    ]
+    times = commit_times([oid for _, oid in worktrees], snapshot)
+    now = int(time.time())
+    stale = ""
+    for path, oid in worktrees:
+        if oid not in times:
+            continue
+        age_days = (now - times[oid]) // 86400
+        if age_days > STALE_WORKTREE_DAYS:
+            stale += f"\\n  {Path(path).name} ({age_days}d)"
+    return stale
+
+
+def main() -> None:
+    args = sys.argv[1:]
+    project_dir = os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
+    learnings_file = (
+        args[0] if args else str(Path(project_dir) / "agents" / "learnings.md")
+    )
+
+    tree_status = check_dirty_tree()
+
+    learning_ages = load_learning_ages()
+    root = head = git_dir = None
+    if learning_ages is not None:
+        root, head = learning_ages.repo_state()
+        _, git_dir = learning_ages.find_git_dir()
+    snapshot = load_snapshot(root) if root else {}
+
+    learnings_status = check_learnings(learnings_file, head, snapshot)
+    stale_wt = check_worktrees(root, git_dir, snapshot) if root else ""
+
+    if root:
+        save_snapshot(root, snapshot)
+
+    message = f"{tree_status}\\nLearnings: {learnings_status}"
+    if stale_wt:
+        message += f"\\n⚠️ Stale worktrees:{stale_wt}"
+    print(message)
+
+
+if __name__ == "__main__":
+    main()
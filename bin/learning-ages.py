@@ -10,6 +10,9 @@ Output: Markdown report to stdout
 Exit: 0 on success, 1 on error (stderr)
 """
 
+import bisect
+import functools
+import json
 import re
 import subprocess
 import sys
@@ -18,6 +21,9 @@ from pathlib import Path
 
 TITLE_PATTERN = re.compile(r"^## (.+)$")
 REMOVED_HEADER_PATTERN = re.compile(r"^-## ")
+# Per-repo cache, relative to the worktree root (HEAD-keyed)
+CACHE_PATH = Path("tmp") / "learning-ages.json"
+BLAME_HEADER_PATTERN = re.compile(r"^[0-9a-f]{40,64} \d+ (\d+)")
 
 
 def extract_titles(lines):
@@ -38,20 +44,25 @@ def extract_titles(lines):
     return titles
 
 
-def get_commit_date_for_line(filepath, line_number):
-    """Get commit date for specific line using git blame.
+def get_commit_dates_for_lines(filepath, line_numbers):
+    """Get commit dates for several lines with a single git blame pass.
 
     Args:
         filepath: Path to file
-        line_number: Line number to blame (1-indexed)
+        line_numbers: Line numbers to blame (1-indexed)
 
     Returns:
-        Date string (YYYY-MM-DD) or None on error
+        Dict mapping line number to date string (YYYY-MM-DD); lines git could
+        not attribute are absent. Empty dict on error.
     """
+    if not line_numbers:
+        return {}
+    ranges = [f"-L{n},{n}" for n in line_numbers]
     try:
-        # git blame -C -C --first-parent -- <file>
+        # git blame -C -C --first-parent -L n,n ... -- <file>
         # -C -C: detect renames and copies across files
         # --first-parent: handle merge commits via first-parent chain
+        # One -L per title: copy detection over history runs once, not per entry
         result = subprocess.run(
             [
                 "git",
@@ -60,7 +71,7 @@ def get_commit_date_for_line(filepath, line_number):
                 "-C",
                 "--first-parent",
                 "--line-porcelain",
-                f"-L{line_number},{line_number}",
+                *ranges,
                 "--",
                 filepath,
             ],
@@ -68,101 +79,277 @@ def get_commit_date_for_line(filepath, line_number):
             text=True,
             check=True,
         )
-
-        # Parse porcelain output for commit date
-        # Format: "committer-time <unix-timestamp>"
-        for line in result.stdout.splitlines():
-            if line.startswith("committer-time "):
-                timestamp = int(line.split()[1])
-                date = datetime.fromtimestamp(timestamp)
-                return date.strftime("%Y-%m-%d")
-
-        return None
     except subprocess.CalledProcessError as e:
-        print(f"Error running git blame for line {line_number}: {e}", file=sys.stderr)
-        return None
+        print(f"Error running git blame: {e}", file=sys.stderr)
+        return {}
+
+    # Parse porcelain output: every line starts with
+    # "<sha> <orig-line> <final-line>[ <count>]" followed by headers including
+    # "committer-time <unix-timestamp>"
+    dates = {}
+    final_line = None
+    for line in result.stdout.splitlines():
+        m = BLAME_HEADER_PATTERN.match(line)
+        if m:
+            final_line = int(m.group(1))
+        elif line.startswith("committer-time ") and final_line is not None:
+            timestamp = int(line.split()[1])
+            date = datetime.fromtimestamp(timestamp)
+            dates[final_line] = date.strftime("%Y-%m-%d")
+    return dates
 
 
-def get_active_days_since(start_date):
-    """Calculate active days (unique commit dates) since start_date.
+def get_commit_date_for_line(filepath, line_number):
+    """Get commit date for specific line using git blame.
 
     Args:
-        start_date: ISO date string (YYYY-MM-DD)
+        filepath: Path to file
+        line_number: Line number to blame (1-indexed)
 
     Returns:
-        Number of unique commit dates from start_date to today
+        Date string (YYYY-MM-DD) or None on error
+    """
+    return get_commit_dates_for_lines(filepath, [line_number]).get(line_number)
+
+
+def find_git_dir(start=None):
+    """Locate (worktree root, git dir) from start (default cwd) upward.
+
+    Follows `gitdir:` files used by worktrees and submodules. Returns
+    (None, None) outside a repository.
     """
+    path = Path(start or Path.cwd()).resolve()
+    for root in (path, *path.parents):
+        dot_git = root / ".git"
+        if dot_git.is_dir():
+            return root, dot_git
+        if dot_git.is_file():
+            content = dot_git.read_text().strip()
+            if content.startswith("gitdir: "):
+                return root, (root / content[len("gitdir: ") :]).resolve()
+    return None, None
+
+
+def read_head_oid(git_dir):
+    """Resolve HEAD to a commit id by reading refs directly (no git spawn).
+
+    Returns None when HEAD cannot be resolved (unborn branch, unusual ref
+    storage); callers then treat caches as stale.
+    """
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+        if not head.startswith("ref: "):
+            return head
+        ref = head[len("ref: ") :]
+        common_dir = git_dir
+        commondir_file = git_dir / "commondir"
+        if commondir_file.is_file():
+            common_dir = (git_dir / commondir_file.read_text().strip()).resolve()
+        for ref_dir in (git_dir, common_dir):
+            if (ref_dir / ref).is_file():
+                return (ref_dir / ref).read_text().strip()
+        packed_refs = common_dir / "packed-refs"
+        if packed_refs.is_file():
+            for line in packed_refs.read_text().splitlines():
+                oid, _, name = line.partition(" ")
+                if name == ref:
+                    return oid
+    except OSError:
+        pass
+    return None
+
+
+def load_cache(root):
+    """Load tmp/learning-ages.json cache (empty dict if missing/corrupt)."""
+    try:
+        with open(root / CACHE_PATH) as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(root, cache) -> None:
+    """Write tmp/learning-ages.json; continue in degraded mode on failure."""
+    try:
+        cache_path = root / CACHE_PATH
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
+
+
+@functools.cache
+def repo_state():
+    """Return (worktree root, HEAD commit id) for cwd; Nones outside a repo."""
+    root, git_dir = find_git_dir()
+    head = read_head_oid(git_dir) if git_dir else None
+    return root, head
+
+
+@functools.cache
+def load_active_dates():
+    """Return sorted unique commit dates (YYYY-MM-DD) reachable from HEAD.
+
+    One `git log` per HEAD: the list is cached in tmp/learning-ages.json keyed
+    by HEAD commit id, so runs on an unchanged repo skip git entirely.
+    """
+    root, head = repo_state()
+    cache = load_cache(root) if root else {}
+    cached = cache.get("active_dates") or {}
+    if head and cached.get("head") == head:
+        return cached["dates"]
+
     try:
-        # Get all commit dates since start_date
         result = subprocess.run(
-            ["git", "log", "--format=%ad", "--date=short", f"--since={start_date}"],
+            ["git", "log", "--format=%ad", "--date=short"],
             capture_output=True,
             text=True,
             check=True,
         )
-
-        # Build set of unique dates
-        commit_dates = set()
-        for line in result.stdout.splitlines():
-            if line.strip():
-                commit_dates.add(line.strip())
-
-        # Edge case: entry added today → 0 active days
-        # (git log --since=<today> includes commits from today)
-        return len(commit_dates)
     except subprocess.CalledProcessError as e:
         print(f"Error calculating active days: {e}", file=sys.stderr)
-        return 0
+        return []
+
+    dates = sorted({line.strip() for line in result.stdout.splitlines()} - {""})
+    if root and head:
+        cache["active_dates"] = {"head": head, "dates": dates}
+        save_cache(root, cache)
+    return dates
+
+
+def get_active_days_since(start_date):
+    """Calculate active days (unique commit dates) since start_date.
+
+    Args:
+        start_date: ISO date string (YYYY-MM-DD)
+
+    Returns:
+        Number of unique commit dates after start_date (binary search over
+        load_active_dates())
+    """
+    dates = load_active_dates()
+    # Edge case: entry added today → 0 active days (start date itself excluded)
+    return len(dates) - bisect.bisect_right(dates, start_date)
+
+
+def scan_consolidation(filepath, revision_range=None):
+    """Find the newest first-parent commit removing an H2 header from filepath.
+
+    Streams `git log -p` line by line and stops at the first removed header,
+    so only the history newer than the last consolidation is read.
+
+    Args:
+        filepath: Path to learnings file
+        revision_range: Optional range limiting the walk (e.g. "<oid>..HEAD")
+
+    Returns:
+        Tuple of (commit_id, date_string) or (None, None) if not found
+
+    Raises:
+        subprocess.CalledProcessError: git log failed
+    """
+    cmd = [
+        "git",
+        "log",
+        "-p",
+        "--first-parent",
+        "--format=commit %H %ad",
+        "--date=short",
+    ]
+    if revision_range:
+        cmd.append(revision_range)
+    cmd += ["--", filepath]
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+    ) as proc:
+        commit = date = None
+        for line in proc.stdout:
+            # Track current commit (patch lines never start with "commit ")
+            if line.startswith("commit "):
+                _, commit, date = line.split()
+            # Look for removed H2 headers (lines starting with "-## ")
+            elif REMOVED_HEADER_PATTERN.match(line) and commit:
+                proc.kill()
+                return commit, date
+        stderr = proc.stderr.read()
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr)
+    return None, None
+
+
+def is_ancestor(commit):
+    """Check whether commit is an ancestor of (or equal to) HEAD."""
+    result = subprocess.run(
+        ["git", "merge-base", "--is-ancestor", commit, "HEAD"],
+        capture_output=True,
+    )
+    return result.returncode == 0
 
 
 def get_last_consolidation_date(filepath):
     """Find last consolidation by detecting removed H2 headers in git log.
 
+    The result is persisted in tmp/learning-ages.json with the HEAD it was
+    computed at. Same HEAD: no git call. HEAD moved forward: only commits
+    since the previously scanned HEAD are searched. Otherwise (rebase, branch
+    switch): full scan.
+
     Args:
         filepath: Path to learnings file
 
     Returns:
         Tuple of (date_string, active_days) or (None, None) if not found
     """
-    try:
-        # Walk git log -p looking for removed H2 headers
-        result = subprocess.run(
-            ["git", "log", "-p", "--first-parent", "--", filepath],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+    root, head = repo_state()
+    cache = load_cache(root) if root else {}
+    key = str(Path(filepath).resolve())
+    entry = cache.get("consolidation", {}).get(key)
 
-        current_commit_date = None
-        for line in result.stdout.splitlines():
-            # Track commit dates
-            if line.startswith("Date:"):
-                # Parse date from git log output
-                # Format: "Date:   Wed Jan 29 12:34:56 2025 -0800"
-                date_str = " ".join(line.split()[1:])
-                try:
-                    date_obj = datetime.strptime(date_str, "%a %b %d %H:%M:%S %Y %z")
-                    current_commit_date = date_obj.strftime("%Y-%m-%d")
-                except ValueError:
-                    continue
+    try:
+        if head and entry and entry["scanned_head"] == head:
+            commit, date = entry["commit"], entry["date"]
+        elif head and entry and is_ancestor(entry["scanned_head"]):
+            commit, date = scan_consolidation(
+                filepath, f"{entry['scanned_head']}..HEAD"
+            )
+            if commit is None:
+                commit, date = entry["commit"], entry["date"]
+        else:
+            commit, date = scan_consolidation(filepath)
+    except subprocess.CalledProcessError as e:
+        print(f"Error searching for consolidation: {e}", file=sys.stderr)
+        return (None, None)
 
-            # Look for removed H2 headers (lines starting with "-## ")
-            if REMOVED_HEADER_PATTERN.match(line) and current_commit_date:
-                # Found most recent consolidation
-                active_days = get_active_days_since(current_commit_date)
-                return (current_commit_date, active_days)
+    if root and head:
+        cache.setdefault("consolidation", {})[key] = {
+            "scanned_head": head,
+            "commit": commit,
+            "date": date,
+        }
+        save_cache(root, cache)
 
+    if date is None:
         # No removed headers found
         return (None, None)
-    except subprocess.CalledProcessError as e:
-        print(f"Error searching for consolidation: {e}", file=sys.stderr)
-        return (None, None)
+    return (date, get_active_days_since(date))
 
 
-def main() -> None:
-    # Parse arguments
-    filepath = sys.argv[1] if len(sys.argv) > 1 else "agents/learnings.md"
+def analyze_learnings(filepath):
+    """Read learnings file and compute entry ages and consolidation staleness.
+
+    Exits 1 with a message on stderr when the file is missing, unreadable or
+    has no entries (shared by main() and bin/health-snapshot.py).
 
+    Returns:
+        Tuple of (lines, entries_with_ages, last_consolidation_date,
+        staleness_days); entries are (title, active_days, commit_date)
+    """
     # Check file exists
     if not Path(filepath).exists():
         print(f"Error: File not found: {filepath}", file=sys.stderr)
@@ -185,8 +372,11 @@ def main() -> None:
 
     # Calculate ages for each entry
     entries_with_ages = []
+    commit_dates = get_commit_dates_for_lines(
+        filepath, [line_num for line_num, _ in titles]
+    )
     for line_num, title in titles:
-        commit_date = get_commit_date_for_line(filepath, line_num)
+        commit_date = commit_dates.get(line_num)
         if commit_date:
             active_days = get_active_days_since(commit_date)
             entries_with_ages.append((title, active_days, commit_date))
@@ -194,6 +384,26 @@ def main() -> None:
     # Get staleness info
     last_consolidation_date, staleness_days = get_last_consolidation_date(filepath)
 
+    return lines, entries_with_ages, last_consolidation_date, staleness_days
+
+
+def format_summary(entries_with_ages, last_consolidation_date, staleness_days):
+    """Format the --summary one-liner used for hook injection."""
+    total_entries = len(entries_with_ages)
+    entries_7plus = len([e for e in entries_with_ages if e[1] >= 7])
+    if last_consolidation_date:
+        return f"{total_entries} entries ({entries_7plus} ≥7 days, consolidation {staleness_days}d ago)"
+    return f"{total_entries} entries ({entries_7plus} ≥7 days, no prior consolidation)"
+
+
+def main() -> None:
+    # Parse arguments
+    filepath = sys.argv[1] if len(sys.argv) > 1 else "agents/learnings.md"
+
+    lines, entries_with_ages, last_consolidation_date, staleness_days = (
+        analyze_learnings(filepath)
+    )
+
     # Calculate summary statistics
     total_entries = len(entries_with_ages)
     entries_7plus = len([e for e in entries_with_ages if e[1] >= 7])
@@ -201,14 +411,9 @@ def main() -> None:
 
     # --summary: one-liner for hook injection
     if "--summary" in sys.argv:
-        if last_consolidation_date:
-            print(
-                f"{total_entries} entries ({entries_7plus} ≥7 days, consolidation {staleness_days}d ago)"
-            )
-        else:
-            print(
-                f"{total_entries} entries ({entries_7plus} ≥7 days, no prior consolidation)"
-            )
+        print(
+            format_summary(entries_with_ages, last_consolidation_date, staleness_days)
+        )
         sys.exit(0)
 
     # Generate markdown report
@@ -12,8 +12,24 @@ Supports:
 - Phase-grouped runbooks (runbook-phase-*.md files in a directory)
 
 Usage:
-    prepare-runbook.py <runbook-file.md>
-    prepare-runbook.py <directory-with-phase-files>
+    prepare-runbook.py [--stats] [--force] <runbook-file.md>
+    prepare-runbook.py [--stats] [--force] <directory-with-phase-files>
+    prepare-runbook.py [--stats] [--force] [--jobs N] --all <plans-dir>
+    prepare-runbook.py [--stats] [--force] [--jobs N] <path> <path>...
+    prepare-runbook.py [--stats] [--force] --watch <runbook-file.md | directory>
+
+Options:
+    --stats  Print recall cache counters and per-stage timings after preparing
+    --all    Prepare every runbook.md / runbook-phase-*.md directory under a
+             directory, in a process pool; prints a pass/fail summary and
+             exits 1 if any runbook failed
+    --jobs   Worker processes for multi-runbook mode (default: CPU count)
+    --force  Regenerate even when the compile manifest shows every input
+             (runbook, recall artifact, design/outline, baseline agents,
+             generator) and artifact unchanged since the last run
+    --watch  Keep running; rebuild after each burst of saves to the runbook or
+             its phase files (polled, debounced). Unchanged phase files are not
+             re-read and unchanged artifacts are not rewritten. Ctrl-C stops.
 
 Example (File):
     prepare-runbook.py plans/foo/runbook.md
@@ -22,6 +38,7 @@ Example (File):
     #   .claude/agents/foo-corrector.md (multi-phase plans only)
     #   plans/foo/steps/step-*.md
     #   plans/foo/orchestrator-plan.md
+    #   plans/foo/prepare-manifest.json (content hashes for incremental re-runs)
 
 Example (Phase Directory):
     prepare-runbook.py plans/foo/
@@ -35,9 +52,24 @@ Example (TDD):
     #   plans/tdd-test/orchestrator-plan.md
 """
 
+import contextlib
+import fcntl
+import functools
+import hashlib
+import inspect
+import io
+import json
+import os
 import re
+import shlex
+import shutil
 import subprocess
 import sys
+import time
+import traceback
+import types
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from importlib.metadata import entry_points
 from pathlib import Path
 
 # Standard TDD stop/error conditions injected into Common Context
@@ -61,6 +93,63 @@ Actions when stopped: 1) Document in reports/cycle-{X}-{Y}-notes.md 2) Test pass
 # Default max_turns budget per step when not specified in step content.
 _DEFAULT_MAX_TURNS = 30
 
+# Compile manifest written next to orchestrator-plan.md (committed). Records
+# content hashes of source runbook files, baseline agents and every generated
+# artifact, keyed by paths relative to the plan directory, so re-runs only
+# rewrite artifacts whose content changed.
+_MANIFEST_NAME = "prepare-manifest.json"
+_MANIFEST_VERSION = 3
+
+# Machine-local (size, mtime_ns) stamps of the manifest's artifacts, one file
+# per plan in the project's tmp/ (per tmp-directory convention). A stamped
+# artifact is trusted without being read; see load_compile_manifest().
+_STAMPS_DIR = Path("tmp") / "prepare-stamps"
+
+# Baseline agent per runbook type, and their bodies keyed by (path, mtime_ns);
+# see read_baseline_agent()
+_BASELINE_AGENTS = {
+    "tdd": Path("plugin/agents/test-driver.md"),
+    "corrector": Path("plugin/agents/corrector.md"),
+    "general": Path("plugin/agents/artisan.md"),
+}
+_BASELINE_CACHE = {}
+
+# Plan documents next to the runbook that artifacts also derive from
+_PLAN_INPUTS = ("recall-artifact.md", "design.md", "outline.md")
+
+# Resolved recall content per trigger group, memoized in the project's tmp/
+# (per tmp-directory convention). Invalidated when the decisions corpus
+# changes; LRU-evicted beyond _RECALL_CACHE_MAX_ENTRIES groups.
+_RECALL_CACHE_PATH = Path("tmp") / "recall-cache.json"
+_RECALL_CACHE_VERSION = 3
+_RECALL_CACHE_MAX_ENTRIES = 1024
+_RECALL_CORPUS_PATHS = (Path("agents/decisions"), Path("agents/memory-index.md"))
+
+# Script run in edify's own interpreter to resolve a batch of trigger groups
+# in one process; {function} is replaced by _run_recall_cli()'s source
+_RECALL_DRIVER = """\
+import contextlib, io, json, sys
+from importlib.metadata import entry_points
+
+{function}
+
+(entry_point,) = entry_points(group="console_scripts", name="edify")
+cli = entry_point.load()
+groups = json.load(sys.stdin)
+json.dump([_run_recall_cli(cli, triggers) for triggers in groups], sys.stdout)
+"""
+
+# Concurrent artifact writers; see flush_artifacts()
+_WRITE_WORKERS = 8
+
+# Per-phase-file scan results keyed by path; see _scan_phase_file()
+_PHASE_SCAN_CACHE = {}
+
+# --watch polling: interval between checks, and quiet period that ends a burst
+# of saves before a rebuild starts
+_WATCH_POLL_SECONDS = 0.1
+_WATCH_DEBOUNCE_SECONDS = 0.15
+
 
 def parse_recall_artifact(artifact_path):
     """Parse recall artifact, extracting entries with optional phase tags.
@@ -96,14 +185,13 @@ def parse_recall_artifact(artifact_path):
 
     shared = []
     phased = {}
-    phase_tag_re = re.compile(r"\(phase\s+(\d+)\)\s*$", re.IGNORECASE)
 
     for entry in entries:
         # Skip null entries
         if entry.startswith("null"):
             continue
 
-        phase_match = phase_tag_re.search(entry)
+        phase_match = _RECALL_PHASE_TAG_RE.search(entry)
         if phase_match:
             phase_num = int(phase_match.group(1))
             clean_entry = entry[: phase_match.start()].rstrip()
@@ -149,11 +237,298 @@ def resolve_recall_entries(triggers):
     return result.stdout
 
 
-def resolve_recall_for_runbook(runbook_path, phase_types):
+@functools.cache
+def _load_recall_cli():
+    """Return the `edify` console script entry point (a click group), or None.
+
+    None unless the package is importable from this interpreter.
+    """
+    try:
+        (entry_point,) = entry_points(group="console_scripts", name="edify")
+        cli = entry_point.load()
+    except Exception:
+        return None
+    return cli if hasattr(cli, "main") else None
+
+
+def _run_recall_cli(cli, triggers):
+    """Run `edify _recall resolve <triggers>` on the edify click group.
+
+    Returns the printed content, or None if the command fails. Also runs in
+    edify's own interpreter (_RECALL_DRIVER), so it needs only contextlib
+    and io.
+    """
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            code = cli.main(
+                args=["_recall", "resolve", *triggers],
+                prog_name="edify",
+                standalone_mode=False,
+            )
+    except SystemExit as e:
+        code = e.code
+    except Exception:
+        return None
+    # Without standalone mode, click returns the exit code instead of exiting
+    if code not in (None, 0):
+        return None
+    return output.getvalue()
+
+
+def _recall_driver_command():
+    """Return the interpreter command of the `edify` console script, or None.
+
+    Read from the script's shebang; None if edify is not on PATH or is not
+    a Python script.
+    """
+    edify = shutil.which("edify")
+    if edify is None:
+        return None
+    try:
+        with open(edify, "rb") as f:
+            first_line = f.readline()
+        command = shlex.split(first_line[2:].decode("utf-8"))
+    except OSError, ValueError:
+        return None
+    if not first_line.startswith(b"#!") or not command:
+        return None
+    if "python" not in os.path.basename(command[-1]):
+        return None
+    return command
+
+
+def _resolve_recall_subprocess(groups):
+    """Resolve {key: [triggers]} in one subprocess; return {key: content}.
+
+    Runs _RECALL_DRIVER in edify's interpreter (_recall_driver_command()),
+    so the whole batch costs one interpreter start. Groups the resolver
+    fails on are missing from the result. Returns None if the driver cannot
+    run at all.
+    """
+    command = _recall_driver_command()
+    if command is None:
+        return None
+    keys = list(groups)
+    driver = _RECALL_DRIVER.replace(
+        "{function}", inspect.getsource(_run_recall_cli)
+    )
+    try:
+        result = subprocess.run(
+            [*command, "-c", driver],
+            input=json.dumps([groups[key] for key in keys]),
+            capture_output=True,
+            text=True,
+        )
+        outputs = json.loads(result.stdout) if result.returncode == 0 else None
+    except OSError, ValueError:
+        return None
+    if not isinstance(outputs, list) or len(outputs) != len(keys):
+        return None
+    failed = any(not isinstance(output, str) for output in outputs)
+    if failed and result.stderr.strip():
+        print(f"WARNING: recall resolve: {result.stderr.strip()}", file=sys.stderr)
+    return {
+        key: output
+        for key, output in zip(keys, outputs, strict=True)
+        if isinstance(output, str)
+    }
+
+
+def resolve_recall_groups(groups):
+    """Resolve {key: [triggers]} in one batch; return {key: content}.
+
+    Each group resolves as `edify _recall resolve <triggers>` prints it. The
+    batch runs in process through the edify click group when importable;
+    groups that fail there, or all of them without it, go to one subprocess
+    in edify's interpreter (_resolve_recall_subprocess()). Only if that
+    cannot start does each group get its own `edify _recall resolve`, run
+    concurrently. Failed groups map to ''.
+    """
+    contents = {}
+    cli = _load_recall_cli()
+    if cli is not None:
+        for key, triggers in groups.items():
+            content = _run_recall_cli(cli, triggers)
+            if content is not None:
+                contents[key] = content
+    rest = {key: triggers for key, triggers in groups.items() if key not in contents}
+    if rest:
+        batch = _resolve_recall_subprocess(rest)
+        if batch is None and shutil.which("edify") is None:
+            print("WARNING: recall resolve: edify not found", file=sys.stderr)
+            batch = {}
+        elif batch is None:
+            # Subprocess-bound: default pool size, not core count
+            with ThreadPoolExecutor() as pool:
+                batch = dict(
+                    zip(rest, pool.map(resolve_recall_entries, rest.values()))
+                )
+        contents.update(batch)
+    return {key: contents.get(key, "") for key in groups}
+
+
+@functools.cache
+def _project_root() -> Path:
+    """Return $CLAUDE_PROJECT_DIR, else the nearest ancestor with .git, else cwd."""
+    project_dir = os.environ.get("CLAUDE_PROJECT_DIR")
+    if project_dir:
+        return Path(project_dir).resolve()
+    cwd = Path.cwd().resolve()
+    for directory in (cwd, *cwd.parents):
+        if (directory / ".git").exists():
+            return directory
+    return cwd
+
+
+def _recall_corpus_hash() -> str:
+    """Hash the decision files recall triggers resolve against."""
+    root = _project_root()
+    digest = hashlib.sha256()
+    for relative_path in _RECALL_CORPUS_PATHS:
+        corpus_path = root / relative_path
+        if corpus_path.is_dir():
+            files = sorted(corpus_path.rglob("*.md"))
+        elif corpus_path.is_file():
+            files = [corpus_path]
+        else:
+            continue
+        for corpus_file in files:
+            try:
+                content = corpus_file.read_bytes()
+            except OSError:
+                continue
+            name = str(corpus_file.relative_to(root))
+            digest.update(name.encode("utf-8") + b"\0")
+            digest.update(content + b"\0")
+    return digest.hexdigest()
+
+
+def _recall_cache_key(triggers) -> str:
+    """Return the recall cache key of a trigger group (order preserved)."""
+    return json.dumps(list(triggers))
+
+
+def load_recall_cache(corpus_hash):
+    """Load recall cache entries if built against the same corpus.
+
+    Returns: {group key: content} in LRU order (oldest first), empty if the
+    cache is missing, corrupted, stale, or from another cache version. Keys
+    are _recall_cache_key() of a resolved trigger group.
+    """
+    try:
+        data = json.loads((_project_root() / _RECALL_CACHE_PATH).read_text())
+    except OSError, ValueError:
+        return {}
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != _RECALL_CACHE_VERSION
+        or data.get("corpus") != corpus_hash
+    ):
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def save_recall_cache(touched, corpus_hash) -> None:
+    """Merge this run's entries into the recall cache file.
+
+    touched: {group key: content} served or resolved by this run, marked most
+    recently used. The file is re-read and rewritten under an exclusive lock,
+    so concurrent runs (multi-runbook mode) add to each other's entries
+    instead of overwriting them. Least recently used entries beyond the
+    limit are evicted.
+    """
+    cache_path = _project_root() / _RECALL_CACHE_PATH
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path.with_name(cache_path.name + ".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            entries = load_recall_cache(corpus_hash)
+            for key, content in touched.items():
+                entries.pop(key, None)
+                entries[key] = content
+            while len(entries) > _RECALL_CACHE_MAX_ENTRIES:
+                del entries[next(iter(entries))]
+            # Temp file + rename: lock-free readers never see a partial file
+            tmp_path = _temp_path(cache_path)
+            tmp_path.write_text(
+                json.dumps(
+                    {
+                        "version": _RECALL_CACHE_VERSION,
+                        "corpus": corpus_hash,
+                        "entries": entries,
+                    }
+                )
+            )
+            os.replace(tmp_path, cache_path)
+    except OSError:
+        # If caching fails, continue in degraded mode
+        pass
+
+
+def resolve_recall_batch(trigger_groups, stats=None):
+    """Resolve several trigger lists in one batch.
+
+    Each group is resolved as a whole, exactly as `edify _recall resolve
+    <triggers>` prints it, and cached under its trigger list. Groups already
+    in the recall cache (<project>/tmp/recall-cache.json, same decisions
+    corpus) are served from it; the rest are resolved together in one
+    resolve_recall_groups() batch.
+
+    Args:
+        trigger_groups: {key: [triggers]} (e.g. 'shared' and phase numbers)
+        stats: Optional new_stats() dict; recall cache hits/misses are counted
+
+    Returns: {key: resolved_content} with '' for empty groups or failures.
+    """
+    resolved = {key: "" for key in trigger_groups}
+    groups = {
+        _recall_cache_key(group): list(group)
+        for group in trigger_groups.values()
+        if group
+    }
+    if not groups:
+        return resolved
+
+    corpus_hash = _recall_corpus_hash()
+    cache = load_recall_cache(corpus_hash)
+    contents = {}
+    pending = []
+    for cache_key in groups:
+        if cache_key in cache:
+            contents[cache_key] = cache[cache_key]
+        else:
+            pending.append(cache_key)
+    if stats is not None:
+        stats["recall_hits"] += len(contents)
+        stats["recall_misses"] += len(pending)
+    # Hits are re-inserted as most recently used
+    touched = dict(contents)
+
+    if pending:
+        contents.update(resolve_recall_groups({key: groups[key] for key in pending}))
+
+    # Cache successful resolutions only ('' may be a transient failure)
+    touched.update(
+        (cache_key, content)
+        for cache_key, content in contents.items()
+        if content and cache_key not in cache
+    )
+    save_recall_cache(touched, corpus_hash)
+
+    for key, group in trigger_groups.items():
+        if group:
+            resolved[key] = contents.get(_recall_cache_key(group), "")
+    return resolved
+
+
+def resolve_recall_for_runbook(runbook_path, phase_types, stats=None):
     """Read and resolve recall artifact for a runbook.
 
     Returns (shared_content, {phase_num: content}) or None on validation error.
     Errors if phase-tagged entries reference nonexistent or inline phases.
+    stats: see resolve_recall_batch().
     """
     plan_dir = Path(runbook_path).parent
     artifact_path = plan_dir / "recall-artifact.md"
@@ -181,15 +556,14 @@ def resolve_recall_for_runbook(runbook_path, phase_types):
             )
             return None
 
-    # Resolve shared entries
-    shared_content = resolve_recall_entries(shared_triggers)
-
-    # Resolve per-phase entries
-    phase_content = {}
-    for phase_num, triggers in sorted(phased_triggers.items()):
-        resolved = resolve_recall_entries(triggers)
-        if resolved:
-            phase_content[phase_num] = resolved
+    # Resolve shared and per-phase entries in one batch
+    resolved = resolve_recall_batch(
+        {"shared": shared_triggers, **dict(sorted(phased_triggers.items()))}, stats
+    )
+    shared_content = resolved.pop("shared")
+    phase_content = {
+        phase_num: content for phase_num, content in resolved.items() if content
+    }
 
     return (shared_content, phase_content)
 
@@ -247,24 +621,24 @@ def extract_cycles(content):
         - title: str (cycle name)
         - content: str (full cycle markdown content)
     """
-    cycle_pattern = r"^###? Cycle\s+(\d+)\.(\d+):\s*(.*)"
-    lines = content.split("\n")
-    tracker = _fence_tracker()
+    lines, events = tokenize_runbook(content)
 
     cycles = []
     current_cycle = None
-    current_content = []
+    content_start = 0
 
-    for _i, line in enumerate(lines):
-        # Update fence state before processing the line
-        in_fence = tracker(line)
+    for i, kind, in_fence in events:
+        # Fenced headers neither start nor terminate cycles
+        if in_fence:
+            continue
+        line = lines[i]
 
-        # Check for cycle header (only if not inside a fence)
-        match = re.match(cycle_pattern, line) if not in_fence else None
+        # Check for cycle header
+        match = _CYCLE_HEADER_RE.match(line) if kind == "cycle" else None
         if match:
             # Save previous cycle
             if current_cycle is not None:
-                current_cycle["content"] = "\n".join(current_content).strip()
+                current_cycle["content"] = "\n".join(lines[content_start:i]).strip()
                 cycles.append(current_cycle)
 
             # Start new cycle
@@ -278,37 +652,20 @@ def extract_cycles(content):
                 "number": f"{major}.{minor}",
                 "title": title,
             }
-            current_content = [line]
-
-        # Check for phase header - terminates current cycle
-        # H3 phase headers (### Phase N:) mark phase boundaries
-        elif (
-            re.match(r"^### Phase\s+\d+", line)
-            and current_cycle is not None
-            and not in_fence
+            content_start = i
+
+        # H3 phase headers (### Phase N:) mark phase boundaries, and any other
+        # H2 terminates the current cycle (H3 like ### RED Phase are cycle content)
+        elif current_cycle is not None and (
+            (kind == "phase" and _H3_PHASE_RE.match(line)) or line.startswith("## ")
         ):
-            current_cycle["content"] = "\n".join(current_content).strip()
+            current_cycle["content"] = "\n".join(lines[content_start:i]).strip()
             cycles.append(current_cycle)
             current_cycle = None
-            current_content = []
-
-        # Check for next H2 (non-cycle section) - terminates current cycle
-        # Only H2 headers terminate cycles (H3 like ### RED Phase are cycle content)
-        # Skip H2 check if inside a fence (so fenced headers don't terminate cycles)
-        elif line.startswith("## ") and current_cycle is not None and not in_fence:
-            # End current cycle - H2 header that's not a cycle terminates the current cycle
-            current_cycle["content"] = "\n".join(current_content).strip()
-            cycles.append(current_cycle)
-            current_cycle = None
-            current_content = []
-
-        # Accumulate content
-        elif current_cycle is not None:
-            current_content.append(line)
 
     # Save final cycle
     if current_cycle is not None:
-        current_cycle["content"] = "\n".join(current_content).strip()
+        current_cycle["content"] = "\n".join(lines[content_start:]).strip()
         cycles.append(current_cycle)
 
     return cycles
@@ -603,6 +960,92 @@ def strip_fenced_blocks(content):
     return result_str
 
 
+# Header dialects used by the extractors below. tokenize_runbook classifies
+# heading lines with the broad _HEADING_KIND_RE; each extractor then applies
+# its own exact pattern to the events of the matching kind.
+_HEADING_KIND_RE = re.compile(r"^#{2,}\s+(Phase|Cycle|Step)\b", re.IGNORECASE)
+_CYCLE_HEADER_RE = re.compile(r"^###? Cycle\s+(\d+)\.(\d+):\s*(.*)")
+_H2_CYCLE_RE = re.compile(r"^##\s+Cycle\s+\d+\.\d+:")
+_ASSEMBLY_CYCLE_RE = re.compile(r"^##+ Cycle\s+\d+\.\d+:")
+_ASSEMBLY_STEP_RE = re.compile(r"^##+ Step\s+\d+\.\d+:")
+_STEP_HEADER_RE = re.compile(r"^## Step\s+([\d.]+):\s*(.*)")
+_STEP_OR_CYCLE_RE = re.compile(r"^##\s+(Step|Cycle)\s+", re.IGNORECASE)
+_H3_PHASE_RE = re.compile(r"^### Phase\s+\d+")
+_SECTION_PHASE_RE = re.compile(r"^###? Phase\s+(\d+)")
+_INLINE_PHASE_RE = re.compile(r"^###? Phase\s+(\d+):.*\(type:\s*inline[^)]*\)")
+_ASSEMBLY_PHASE_RE = re.compile(r"^###? Phase\s+(\d+):")
+_TYPED_PHASE_RE = re.compile(r"^###?\s+Phase\s+(\d+):")
+_PREAMBLE_PHASE_RE = re.compile(r"^###?\s+Phase\s+(\d+):", re.IGNORECASE)
+_PHASE_MODEL_RE = re.compile(
+    r"^###?\s+Phase\s+(\d+):.*model:\s*(\w+)", re.IGNORECASE
+)
+_INLINE_TYPE_RE = re.compile(r"\(type:\s*inline[^)]*\)", re.IGNORECASE)
+_PHASE_FILE_RE = re.compile(r"runbook-phase-(\d+)\.md")
+_RECALL_PHASE_TAG_RE = re.compile(r"\(phase\s+(\d+)\)\s*$", re.IGNORECASE)
+_COMMON_CONTEXT_RE = re.compile(r"## Common Context\s*\n(.*?)(?=\n## |\Z)", re.DOTALL)
+_PHASE_PREAMBLE_RE = re.compile(r"### Phase\s+\d+:.*?\n(.*?)(?=\n## )", re.DOTALL)
+_BOOTSTRAP_SEPARATOR_RE = re.compile(r"\n---\s*\n")
+
+# Step/cycle body fields; see extract_step_metadata()
+_EXECUTION_MODEL_RE = re.compile(r"\*\*Execution Model\*\*:\s*(\w+)", re.IGNORECASE)
+_REPORT_PATH_RE = re.compile(r"\*\*Report Path\*\*:\s*`?([^`\n]+)`?")
+_MAX_TURNS_RE = re.compile(r"\*\*Max Turns\*\*:\s*(\d+)", re.IGNORECASE)
+
+# File references; see extract_file_references() / validate_file_references().
+# _CREATED_REF_RE captures, for every creation verb, the first backticked span
+# after it (zero-width, so verbs inside a captured span are still seen).
+_FILE_REF_RE = re.compile(
+    r"`([a-zA-Z][a-zA-Z0-9_.\-]*/[a-zA-Z0-9_/.\-]*"
+    r"\.(?:py|md|json|sh|txt|toml|yml|yaml|cfg|ini|js|ts|tsx))`"
+)
+_REPORTS_DIR_RE = re.compile(r"plans/[^/]+/reports/")
+_CREATED_REF_RE = re.compile(r"(?=(?:Create|Write|mkdir)[^`]*`([^`]*)`)", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=32)
+def tokenize_runbook(content):
+    """Classify runbook lines in a single fence-aware pass.
+
+    All structural extractors are views over this result, so a runbook body
+    is scanned once no matter how many of them run against it. Results are
+    memoized per content string.
+
+    Returns: (lines, events)
+        - lines: tuple of content lines, one entry per newline-separated line
+        - events: tuple of (line_idx, kind, in_fence) for every heading line,
+          in document order. kind is 'phase', 'cycle' or 'step' for those
+          headers (any level, any case), 'h2' for other '## ' lines, and
+          'heading' for remaining '#' lines.
+    """
+    lines = tuple(content.split("\n"))
+    tracker = _fence_tracker()
+    events = []
+
+    for i, line in enumerate(lines):
+        # Fence state must advance on every line, headings or not
+        in_fence = tracker(line)
+        if not line.startswith("#"):
+            continue
+        kind_match = _HEADING_KIND_RE.match(line)
+        if kind_match:
+            kind = kind_match.group(1).lower()
+        elif line.startswith("## "):
+            kind = "h2"
+        else:
+            kind = "heading"
+        events.append((i, kind, in_fence))
+
+    return lines, tuple(events)
+
+
+def _has_h2_cycle(lines, events) -> bool:
+    """Return True if any unfenced event is an H2 ## Cycle X.Y: header."""
+    return any(
+        kind == "cycle" and not in_fence and _H2_CYCLE_RE.match(lines[i])
+        for i, kind, in_fence in events
+    )
+
+
 def extract_sections(content):
     """Extract Common Context, Steps, Inline Phases, and Orchestrator sections.
 
@@ -623,141 +1066,114 @@ def extract_sections(content):
         "orchestrator": None,
     }
 
-    lines = content.split("\n")
+    lines, events = tokenize_runbook(content)
+    # Fenced headers never act as boundaries
+    visible = [(i, kind) for i, kind, in_fence in events if not in_fence]
 
-    # First pass: Build a map of line numbers to phases and detect inline phases
-    line_to_phase = {}
-    current_phase = 1  # Default phase for flat runbooks
-    phase_pattern = r"^###? Phase\s+(\d+)"
-    inline_phase_pattern = r"^###? Phase\s+(\d+):.*\(type:\s*inline[^)]*\)"
+    # Phase headers and inline phase detection
+    phase_headers = {}  # line_idx -> phase number
     inline_phase_nums = set()
-    tracker = _fence_tracker()
-
-    for i, line in enumerate(lines):
-        in_fence = tracker(line)
-        phase_match = re.match(phase_pattern, line) if not in_fence else None
+    for i, kind in visible:
+        if kind != "phase":
+            continue
+        phase_match = _SECTION_PHASE_RE.match(lines[i])
         if phase_match:
-            current_phase = int(phase_match.group(1))
-            if re.match(inline_phase_pattern, line):
-                inline_phase_nums.add(current_phase)
-        line_to_phase[i] = current_phase
+            phase_headers[i] = int(phase_match.group(1))
+            if _INLINE_PHASE_RE.match(lines[i]):
+                inline_phase_nums.add(phase_headers[i])
 
     # Extract inline phase content (text between phase header and next phase/H2)
     if inline_phase_nums:
-        in_inline = False
         inline_num = None
-        inline_content = []
-        tracker = _fence_tracker()
-        for i, line in enumerate(lines):
-            in_fence = tracker(line)
-            phase_match = re.match(phase_pattern, line) if not in_fence else None
-            if phase_match:
-                # Save previous inline phase
-                if in_inline and inline_content:
-                    sections["inline_phases"][inline_num] = "\n".join(
-                        inline_content
-                    ).strip()
-                phase_num = int(phase_match.group(1))
-                if phase_num in inline_phase_nums:
-                    in_inline = True
-                    inline_num = phase_num
-                    inline_content = [line]
-                else:
-                    in_inline = False
-                    inline_content = []
-            elif line.startswith("## ") and in_inline and not in_fence:
-                # H2 terminates inline phase collection
+        inline_start = None
+        for i, _kind in visible:
+            is_phase = i in phase_headers
+            if not is_phase and not lines[i].startswith("## "):
+                continue
+            # Phase header or H2 terminates the current inline phase
+            if inline_start is not None:
                 sections["inline_phases"][inline_num] = "\n".join(
-                    inline_content
+                    lines[inline_start:i]
                 ).strip()
-                in_inline = False
-                inline_content = []
-            elif in_inline:
-                inline_content.append(line)
+                inline_start = None
+            if is_phase and phase_headers[i] in inline_phase_nums:
+                inline_num = phase_headers[i]
+                inline_start = i
         # Save final inline phase
-        if in_inline and inline_content:
-            sections["inline_phases"][inline_num] = "\n".join(inline_content).strip()
+        if inline_start is not None:
+            sections["inline_phases"][inline_num] = "\n".join(
+                lines[inline_start:]
+            ).strip()
 
-    # Second pass: Extract sections with phase information
+    # Extract sections with phase information
+    current_phase = 1  # Default phase for flat runbooks
     current_section = None
-    current_content = []
+    current_start = 0
     current_step = None
-    current_step_line = None
-    step_pattern = r"^## Step\s+([\d.]+):\s*(.*)"
-    tracker = _fence_tracker()
+    current_step_phase = None
 
-    def save_current() -> None:
-        if current_section and current_content:
-            content_str = "\n".join(current_content).strip()
-            if current_section == "common_context":
-                sections["common_context"] = content_str
-            elif current_section == "outline":
-                sections["outline"] = content_str
-            elif current_section == "orchestrator":
-                sections["orchestrator"] = content_str
-            elif current_section == "step":
+    def save_current(end) -> None:
+        if current_section:
+            content_str = "\n".join(lines[current_start:end]).strip()
+            if current_section == "step":
                 sections["steps"][current_step] = content_str
-                sections["step_phases"][current_step] = line_to_phase[current_step_line]
+                sections["step_phases"][current_step] = current_step_phase
+            else:
+                sections[current_section] = content_str
 
-    for i, line in enumerate(lines):
-        in_fence = tracker(line)
+    for i, kind in visible:
+        line = lines[i]
 
-        # Phase headers are section boundaries (only when not inside a fence)
-        if re.match(phase_pattern, line) and not in_fence:
-            save_current()
+        # Phase headers are section boundaries
+        if i in phase_headers:
+            save_current(i)
+            current_phase = phase_headers[i]
             current_section = None
-            current_content = []
             continue
 
-        if line.startswith("## ") and not in_fence:
-            save_current()
-
-            # Detect new section
-            if line == "## Common Context":
-                current_section = "common_context"
-                current_content = [line]
-            elif line == "## Outline":
-                current_section = "outline"
-                current_content = [line]
-            elif line.startswith("## Step "):
-                match = re.match(step_pattern, line)
-                if match:
-                    step_num = match.group(1)
-                    if step_num in sections["steps"]:
-                        print(
-                            f"ERROR: Duplicate step number: {step_num}", file=sys.stderr
-                        )
-                        return None
-                    current_section = "step"
-                    current_step = step_num
-                    current_step_line = i
-                    current_content = [line]
-                else:
-                    current_section = None
-                    current_content = []
-            elif line == "## Orchestrator Instructions":
-                current_section = "orchestrator"
-                current_content = [line]
+        if not line.startswith("## "):
+            continue
+
+        save_current(i)
+        current_start = i
+
+        # Detect new section
+        if line == "## Common Context":
+            current_section = "common_context"
+        elif line == "## Outline":
+            current_section = "outline"
+        elif line.startswith("## Step "):
+            match = _STEP_HEADER_RE.match(line)
+            if match:
+                step_num = match.group(1)
+                if step_num in sections["steps"]:
+                    print(f"ERROR: Duplicate step number: {step_num}", file=sys.stderr)
+                    return None
+                current_section = "step"
+                current_step = step_num
+                current_step_phase = current_phase
             else:
                 current_section = None
-                current_content = []
-        elif current_section:
-            current_content.append(line)
+        elif line == "## Orchestrator Instructions":
+            current_section = "orchestrator"
+        else:
+            current_section = None
 
-    save_current()
+    save_current(len(lines))
     return sections
 
 
 def extract_phase_models(content):
     """Return {phase_num: model} for phases that have a model: annotation."""
-    stripped_content = strip_fenced_blocks(content)
-    pattern = re.compile(
-        r"^###?\s+Phase\s+(\d+):.*model:\s*(\w+)",
-        re.IGNORECASE | re.MULTILINE,
-    )
-    return {
-        int(m.group(1)): m.group(2).lower() for m in pattern.finditer(stripped_content)
-    }
+    lines, events = tokenize_runbook(content)
+    models = {}
+    for i, kind, in_fence in events:
+        if kind != "phase" or in_fence:
+            continue
+        match = _PHASE_MODEL_RE.match(lines[i])
+        if match:
+            models[int(match.group(1))] = match.group(2).lower()
+    return models
 
 
 def extract_phase_preambles(content):
@@ -767,35 +1183,32 @@ def extract_phase_preambles(content):
     next phase header). Phases with no content between header and first
     step/cycle get an empty string.
     """
-    phase_header = re.compile(r"^###?\s+Phase\s+(\d+):", re.IGNORECASE | re.MULTILINE)
-    step_or_cycle = re.compile(r"^##\s+(Step|Cycle)\s+", re.IGNORECASE | re.MULTILINE)
+    lines, events = tokenize_runbook(content)
 
     preambles = {}
     current_phase = None
-    preamble_lines = []
-    collecting = False
-    tracker = _fence_tracker()
+    preamble_start = None  # First preamble line while collecting, else None
 
-    for line in content.splitlines():
-        in_fence = tracker(line)
-        ph_match = phase_header.match(line)
-        sc_match = step_or_cycle.match(line)
+    for i, kind, in_fence in events:
+        line = lines[i]
+        ph_match = _PREAMBLE_PHASE_RE.match(line) if kind == "phase" else None
+        sc_match = (
+            _STEP_OR_CYCLE_RE.match(line) if kind in ("step", "cycle") else None
+        )
 
         if ph_match:
             if current_phase is not None and current_phase not in preambles:
-                preambles[current_phase] = "\n".join(preamble_lines).strip()
+                preambles[current_phase] = "\n".join(
+                    lines[preamble_start:i]
+                ).strip()
             current_phase = int(ph_match.group(1))
-            preamble_lines = []
-            collecting = True
-        elif sc_match and collecting and not in_fence:
-            collecting = False
-            preambles[current_phase] = "\n".join(preamble_lines).strip()
-            preamble_lines = []
-        elif collecting:
-            preamble_lines.append(line)
+            preamble_start = i + 1
+        elif sc_match and preamble_start is not None and not in_fence:
+            preambles[current_phase] = "\n".join(lines[preamble_start:i]).strip()
+            preamble_start = None
 
     if current_phase is not None and current_phase not in preambles:
-        preambles[current_phase] = "\n".join(preamble_lines).strip()
+        preambles[current_phase] = "\n".join(lines[preamble_start:]).strip()
 
     return preambles
 
@@ -806,8 +1219,8 @@ def get_phase_baseline_type(phase_content) -> str:
     Returns "tdd" if the content contains Cycle headers (indicating TDD
     workflow), "general" otherwise.
     """
-    stripped = strip_fenced_blocks(phase_content)
-    if re.search(r"^##\s+Cycle\s+\d+\.\d+:", stripped, re.MULTILINE):
+    lines, events = tokenize_runbook(phase_content)
+    if _has_h2_cycle(lines, events):
         return "tdd"
     return "general"
 
@@ -817,39 +1230,76 @@ def detect_phase_types(content) -> dict:
 
     Classifies each phase as "tdd", "general", or "inline":
     - "inline" if the phase header contains `(type: inline)`
-    - Otherwise delegates to get_phase_baseline_type() on the phase's content
+    - Otherwise "tdd" if the phase's content has Cycle headers, else "general"
+      (same rule as get_phase_baseline_type())
     """
-    stripped = strip_fenced_blocks(content)
-    phase_header_re = re.compile(r"^###?\s+Phase\s+(\d+):", re.MULTILINE)
-    inline_re = re.compile(r"\(type:\s*inline[^)]*\)", re.IGNORECASE)
+    lines, events = tokenize_runbook(content)
+    visible = [event for event in events if not event[2]]
 
-    # Find all phase header positions and numbers
-    matches = list(phase_header_re.finditer(stripped))
-    if not matches:
+    # Find all phase header positions (index into visible) and numbers
+    headers = []
+    for pos, (i, kind, _in_fence) in enumerate(visible):
+        if kind != "phase":
+            continue
+        match = _TYPED_PHASE_RE.match(lines[i])
+        if match:
+            headers.append((pos, int(match.group(1))))
+    if not headers:
         return {}
 
     result = {}
-    for i, m in enumerate(matches):
-        phase_num = int(m.group(1))
-        header_line = (
-            stripped[m.start() : stripped.index("\n", m.start())]
-            if "\n" in stripped[m.start() :]
-            else stripped[m.start() :]
-        )
-        if inline_re.search(header_line):
+    for n, (pos, phase_num) in enumerate(headers):
+        header_line = lines[visible[pos][0]]
+        if _INLINE_TYPE_RE.search(header_line):
             result[phase_num] = "inline"
         else:
-            # Extract content from after the header to the next phase header (or end)
-            content_start = m.end()
-            content_end = (
-                matches[i + 1].start() if i + 1 < len(matches) else len(stripped)
+            # Inspect events from after the header to the next phase header (or end)
+            end = headers[n + 1][0] if n + 1 < len(headers) else len(visible)
+            phase_events = visible[pos + 1 : end]
+            result[phase_num] = (
+                "tdd" if _has_h2_cycle(lines, phase_events) else "general"
             )
-            phase_content = stripped[content_start:content_end]
-            result[phase_num] = get_phase_baseline_type(phase_content)
 
     return result
 
 
+def _scan_phase_file(phase_file, phase_num):
+    """Read one phase file and detect its Cycle/Step/own Phase headers.
+
+    Returns (content, has_cycles, has_steps, has_own_header). Memoized on the
+    file's (mtime_ns, size), so repeated assemblies (--watch) only re-read and
+    re-tokenize phase files that changed.
+    """
+    st = phase_file.stat()
+    key = (st.st_mtime_ns, st.st_size, phase_num)
+    cached = _PHASE_SCAN_CACHE.get(str(phase_file))
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    content = phase_file.read_text()
+    lines, events = tokenize_runbook(content)
+    has_cycles = any(
+        kind == "cycle" and not in_fence and _ASSEMBLY_CYCLE_RE.match(lines[idx])
+        for idx, kind, in_fence in events
+    )
+    has_steps = any(
+        kind == "step" and not in_fence and _ASSEMBLY_STEP_RE.match(lines[idx])
+        for idx, kind, in_fence in events
+    )
+    has_own_header = False
+    for idx, kind, _in_fence in events:
+        if kind != "phase":
+            continue
+        header_match = _ASSEMBLY_PHASE_RE.match(lines[idx])
+        if header_match and header_match.group(1) == str(phase_num):
+            has_own_header = True
+            break
+
+    result = (content, has_cycles, has_steps, has_own_header)
+    _PHASE_SCAN_CACHE[str(phase_file)] = (key, result)
+    return result
+
+
 def assemble_phase_files(directory):
     """Assemble runbook from phase files in a directory.
 
@@ -874,7 +1324,7 @@ def assemble_phase_files(directory):
 
     # Extract phase numbers for sorting
     def get_phase_num(path):
-        match = re.search(r"runbook-phase-(\d+)\.md", path.name)
+        match = _PHASE_FILE_RE.search(path.name)
         return int(match.group(1)) if match else float("inf")
 
     phase_files = sorted(phase_files, key=get_phase_num)
@@ -899,19 +1349,14 @@ def assemble_phase_files(directory):
     has_any_cycles = False
 
     for i, phase_file in enumerate(phase_files):
-        content = phase_file.read_text()
+        phase_num = phase_nums[i]
+        content, file_has_cycles, file_has_steps, has_own_header = _scan_phase_file(
+            phase_file, phase_num
+        )
         if not content.strip():
             print(f"ERROR: Empty phase file: {phase_file}", file=sys.stderr)
             return None, None
 
-        stripped_content = strip_fenced_blocks(content)
-        file_has_cycles = bool(
-            re.search(r"^##+ Cycle\s+\d+\.\d+:", stripped_content, re.MULTILINE)
-        )
-        file_has_steps = bool(
-            re.search(r"^##+ Step\s+\d+\.\d+:", stripped_content, re.MULTILINE)
-        )
-
         if file_has_cycles:
             has_any_cycles = True
 
@@ -926,8 +1371,7 @@ def assemble_phase_files(directory):
                 )
                 return None, None
 
-        phase_num = phase_nums[i]
-        if re.search(rf"^###? Phase\s+{phase_num}:", content, re.MULTILINE):
+        if has_own_header:
             assembled_parts.append(f"\n{content}")
         else:
             assembled_parts.append(f"\n### Phase {phase_num}:\n\n{content}")
@@ -977,6 +1421,22 @@ def derive_paths(runbook_path):
     return runbook_name, agents_dir, steps_dir, orchestrator_path
 
 
+@functools.cache
+def _manifest_agents(plugin_root):
+    """Return {relative path: agent entry} from the compiled plugin manifest.
+
+    bin/compile-manifest.py writes <plugin>/.edify-manifest.json with
+    frontmatter-stripped agent bodies. Empty dict if missing or unreadable.
+    """
+    try:
+        manifest = json.loads((plugin_root / ".edify-manifest.json").read_text())
+        if manifest.get("version") != 2:
+            return {}
+        return {agent["path"]: agent for agent in manifest["agents"]}
+    except OSError, ValueError, KeyError, TypeError:
+        return {}
+
+
 def read_baseline_agent(runbook_type="general"):
     """Read baseline agent template based on runbook type.
 
@@ -986,20 +1446,424 @@ def read_baseline_agent(runbook_type="general"):
     Returns:
         Baseline agent body (without frontmatter)
     """
-    if runbook_type == "tdd":
-        baseline_path = Path("plugin/agents/test-driver.md")
-    elif runbook_type == "corrector":
-        baseline_path = Path("plugin/agents/corrector.md")
-    else:
-        baseline_path = Path("plugin/agents/artisan.md")
+    baseline_path = _BASELINE_AGENTS.get(runbook_type, _BASELINE_AGENTS["general"])
 
-    if not baseline_path.exists():
+    try:
+        mtime_ns = baseline_path.stat().st_mtime_ns
+    except OSError:
         print(f"ERROR: Baseline agent not found: {baseline_path}", file=sys.stderr)
         sys.exit(1)
 
-    content = baseline_path.read_text()
-    _, body = parse_frontmatter(content)
-    return body
+    # Several agents share a baseline; read and parse each file once per run
+    cache_key = (str(baseline_path), mtime_ns)
+    if cache_key not in _BASELINE_CACHE:
+        plugin_root = baseline_path.parent.parent
+        agent = _manifest_agents(plugin_root).get(
+            str(baseline_path.relative_to(plugin_root))
+        )
+        if agent is not None and agent.get("mtime_ns") == mtime_ns:
+            _BASELINE_CACHE[cache_key] = agent["body"]
+        else:
+            content = baseline_path.read_text()
+            _, body = parse_frontmatter(content)
+            _BASELINE_CACHE[cache_key] = body
+    return _BASELINE_CACHE[cache_key]
+
+
+def _content_hash(content) -> str:
+    """Return sha256 hex digest of a text artifact."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=8192)
+def _plan_key(path, plan_dir) -> str:
+    """Return path as a manifest key: relative to the plan directory."""
+    return os.path.relpath(path, plan_dir)
+
+
+@functools.lru_cache(maxsize=8192)
+def _local_path(key, plan_dir) -> str:
+    """Return the path a manifest key names, as the generator spells paths."""
+    return os.path.normpath(os.path.join(plan_dir, key))
+
+
+def _stamps_path(manifest_path) -> Path:
+    """Return the local stamp cache file for a plan's compile manifest."""
+    plan_id = hashlib.sha256(str(Path(manifest_path).resolve()).encode("utf-8"))
+    return _project_root() / _STAMPS_DIR / f"{plan_id.hexdigest()[:16]}.json"
+
+
+def load_artifact_stamps(manifest_path) -> dict:
+    """Load {manifest key: entry with mtime_ns} from the local stamp cache.
+
+    Empty if the cache is missing or unreadable.
+    """
+    try:
+        data = json.loads(_stamps_path(manifest_path).read_text())
+    except OSError, ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_artifact_stamps(artifacts, manifest_path) -> None:
+    """Write artifacts' entries (with mtime_ns) to the local stamp cache.
+
+    artifacts is keyed by local path (see _record_artifact()). Best effort:
+    without stamps, the next run compares artifact contents instead.
+    """
+    plan_dir = Path(manifest_path).parent
+    stamps = {
+        _plan_key(path, plan_dir): entry for path, entry in artifacts.items()
+    }
+    stamps_path = _stamps_path(manifest_path)
+    try:
+        stamps_path.parent.mkdir(parents=True, exist_ok=True)
+        write_artifact(stamps_path, json.dumps(stamps, sort_keys=True) + "\n")
+    except OSError:
+        pass
+
+
+def load_compile_manifest(manifest_path):
+    """Load compile manifest from a previous run.
+
+    Artifact and baseline keys are returned as local paths. Artifact entries
+    carry the mtime_ns of the local stamp cache when its stamp was taken of
+    the same content (_artifact_intact() needs it to trust a file unread).
+    Returns an empty manifest if the file is missing, unreadable, or was
+    written by a different manifest version.
+    """
+    manifest = {
+        "version": _MANIFEST_VERSION,
+        "inputs": {},
+        "baselines": {},
+        "artifacts": {},
+        "warnings": [],
+    }
+    try:
+        data = json.loads(Path(manifest_path).read_text())
+    except OSError, ValueError:
+        return manifest
+    if not isinstance(data, dict) or data.get("version") != _MANIFEST_VERSION:
+        return manifest
+    plan_dir = Path(manifest_path).parent
+    if isinstance(data.get("inputs"), dict):
+        manifest["inputs"] = data["inputs"]
+    if isinstance(data.get("baselines"), dict):
+        manifest["baselines"] = {
+            _local_path(key, plan_dir): digest
+            for key, digest in data["baselines"].items()
+        }
+    if isinstance(data.get("warnings"), list):
+        manifest["warnings"] = [str(warning) for warning in data["warnings"]]
+    if isinstance(data.get("artifacts"), dict):
+        stamps = load_artifact_stamps(manifest_path)
+        for key, entry in data["artifacts"].items():
+            if not isinstance(entry, dict):
+                continue
+            stamp = stamps.get(key)
+            if (
+                isinstance(stamp, dict)
+                and stamp.get("sha256") == entry.get("sha256")
+                and stamp.get("size") == entry.get("size")
+            ):
+                entry = {**entry, "mtime_ns": stamp.get("mtime_ns")}
+            manifest["artifacts"][_local_path(key, plan_dir)] = entry
+    return manifest
+
+
+def save_compile_manifest(manifest, manifest_path) -> bool:
+    """Write compile manifest, leaving the file untouched if unchanged.
+
+    The committed file holds only content hashes and sizes, keyed relative to
+    the plan directory, so it is identical on every checkout; the artifacts'
+    mtime_ns stamps go to the local stamp cache (save_artifact_stamps()).
+    Returns True if the file was written.
+    """
+    plan_dir = Path(manifest_path).parent
+    save_artifact_stamps(manifest["artifacts"], manifest_path)
+    committed = {
+        **manifest,
+        "baselines": {
+            _plan_key(path, plan_dir): digest
+            for path, digest in manifest["baselines"].items()
+        },
+        "artifacts": {
+            _plan_key(path, plan_dir): {
+                "sha256": entry["sha256"],
+                "size": entry["size"],
+            }
+            for path, entry in manifest["artifacts"].items()
+        },
+    }
+    return write_artifact(
+        Path(manifest_path), json.dumps(committed, indent=2, sort_keys=True) + "\n"
+    )
+
+
+def new_stats() -> dict:
+    """Return a --stats accumulator for one prepare run.
+
+    Holds recall cache counters and seconds per pipeline stage, plus the
+    clock mark of the last stage boundary. Each run (one runbook, one watch
+    rebuild, one batch worker) gets its own, threaded through as stats=.
+    """
+    return {
+        "recall_hits": 0,
+        "recall_misses": 0,
+        "stages": {},
+        "mark": time.perf_counter(),
+    }
+
+
+def _end_stage(stats, stage) -> None:
+    """Charge time since the previous stage boundary to stage (no-op if None)."""
+    if stats is None:
+        return
+    now = time.perf_counter()
+    stages = stats["stages"]
+    stages[stage] = stages.get(stage, 0.0) + now - stats["mark"]
+    stats["mark"] = now
+
+
+@functools.lru_cache(maxsize=8192)
+def _artifact_entry(content) -> dict:
+    """Return the manifest entry (sha256, size) for rendered content.
+
+    Memoized per content (callers must not mutate the entry): a --watch
+    rebuild hashes only the artifacts whose rendering changed.
+    """
+    return {"sha256": _content_hash(content), "size": len(content.encode("utf-8"))}
+
+
+def _artifact_intact(path, recorded) -> bool:
+    """Return True if path still matches its stamped entry (size, mtime_ns)."""
+    try:
+        st = path.stat()
+    except OSError:
+        return False
+    return (
+        recorded.get("size") == st.st_size
+        and recorded.get("mtime_ns") == st.st_mtime_ns
+    )
+
+
+def _artifact_unchanged(path, content, entry, previous) -> bool:
+    """Return True if path already holds content.
+
+    A file whose recorded hash matches and whose size and mtime_ns are those
+    recorded by the previous run is trusted without being read; otherwise
+    (e.g. edited by hand since) the file is compared directly.
+    """
+    recorded = (previous or {}).get(str(path)) or {}
+    if recorded.get("sha256") == entry["sha256"] and _artifact_intact(path, recorded):
+        return True
+    try:
+        return path.read_text() == content
+    except OSError, UnicodeDecodeError:
+        return False
+
+
+def _record_artifact(artifacts, path, entry) -> None:
+    """Record path's manifest entry, stamped with its on-disk mtime_ns."""
+    if artifacts is None:
+        return
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    artifacts[str(path)] = {**entry, "mtime_ns": mtime_ns}
+
+
+def _temp_path(path):
+    """Return the sibling temp file used to write path atomically."""
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+def _write_temp(path, content):
+    """Write content to path's temp file and fsync it; return the temp path.
+
+    The data must be on disk before the rename, or a crash could leave the
+    renamed artifact empty or truncated.
+    """
+    tmp_path = _temp_path(path)
+    with open(tmp_path, "w") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp_path
+
+
+def _fsync_dir(directory) -> None:
+    """Persist renames in directory (best effort; unsupported on some OSes)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_artifact(path, content, previous=None, artifacts=None) -> bool:
+    """Write a generated file unless identical content is already on disk.
+
+    Unchanged files are not rewritten, so their mtimes stay stable for
+    watchers and git. When manifest dicts are given, a file whose recorded
+    hash, size and mtime match the previous run is trusted without being
+    read, and the new entry is recorded in artifacts. Files are replaced atomically
+    and durably (fsynced temp file + rename + directory fsync).
+
+    Args:
+        path: Output file path
+        content: Rendered file content
+        previous: Optional artifacts dict from the previous run's manifest
+        artifacts: Optional artifacts dict being built for this run
+
+    Returns True if the file was written.
+    """
+    entry = _artifact_entry(content)
+    written = not _artifact_unchanged(path, content, entry, previous)
+    if written:
+        os.replace(_write_temp(path, content), path)
+        _fsync_dir(path.parent)
+    _record_artifact(artifacts, path, entry)
+    return written
+
+
+def flush_artifacts(pending, previous=None, artifacts=None) -> list:
+    """Write queued artifacts concurrently; return written (path, label) pairs.
+
+    pending is a list of (path, content, label) in generation order. An
+    artifact whose hash and on-disk stamp match the previous run's manifest
+    costs one stat here; the others go to a thread pool for the unchanged
+    check (a read) and temp-file writes, each fsynced in its worker, so the
+    data syncs run in parallel. Only after the pool joins (the data barrier)
+    are temp files renamed into place (in queue order), so an interrupted
+    run never leaves a partially written artifact. The renames are then made
+    durable with one fsync per output directory.
+    """
+
+    def prepare(item):
+        path, content, _label = item
+        entry = _artifact_entry(content)
+        if _artifact_unchanged(path, content, entry, previous):
+            return entry, None
+        return entry, _write_temp(path, content)
+
+    prepared = []
+    queued = []
+    for item in pending:
+        path, content, _label = item
+        entry = _artifact_entry(content)
+        recorded = (previous or {}).get(str(path)) or {}
+        if recorded.get("sha256") == entry["sha256"] and _artifact_intact(
+            path, recorded
+        ):
+            prepared.append((entry, None))
+        else:
+            queued.append(len(prepared))
+            prepared.append(None)
+    try:
+        with ThreadPoolExecutor(max_workers=_WRITE_WORKERS) as pool:
+            for index, result in zip(
+                queued, pool.map(prepare, [pending[i] for i in queued]), strict=True
+            ):
+                prepared[index] = result
+    except BaseException:
+        for path, _content, _label in pending:
+            _temp_path(path).unlink(missing_ok=True)
+        raise
+
+    written = []
+    directories = set()
+    for (path, _content, label), (entry, tmp_path) in zip(
+        pending, prepared, strict=True
+    ):
+        if tmp_path is not None:
+            os.replace(tmp_path, path)
+            directories.add(path.parent)
+            written.append((path, label))
+        _record_artifact(artifacts, path, entry)
+    for directory in sorted(directories):
+        _fsync_dir(directory)
+    return written
+
+
+def _file_hash(path) -> str | None:
+    """Return sha256 hex digest of a file's bytes, or None if unreadable."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _input_paths(runbook_path, phase_dir=None) -> list:
+    """Return the runbook file (or its phase files) and the _PLAN_INPUTS."""
+    plan_dir = Path(runbook_path).parent
+    if phase_dir:
+        sources = sorted(Path(phase_dir).glob("runbook-phase-*.md"))
+    else:
+        sources = [Path(runbook_path)]
+    return [*sources, *(plan_dir / name for name in _PLAN_INPUTS)]
+
+
+def _input_hashes(runbook_path, phase_dir=None):
+    """Return {input: sha256 or None} for everything artifacts derive from.
+
+    Covers the runbook file (or its phase files), the plan's recall artifact,
+    design and outline documents (None while missing), keyed relative to the
+    plan directory, plus this generator and the decisions corpus when a
+    recall artifact exists. Baseline agents are recorded separately
+    ("baselines"), since which ones apply depends on the parsed runbook type.
+    """
+    plan_dir = Path(runbook_path).parent
+    inputs = {
+        _plan_key(path, plan_dir): _file_hash(path)
+        for path in _input_paths(runbook_path, phase_dir)
+    }
+    inputs["generator"] = _file_hash(__file__)
+    if inputs["recall-artifact.md"] is not None:
+        inputs["recall-corpus"] = _recall_corpus_hash()
+    return inputs
+
+
+def check_up_to_date(runbook_path, phase_dir=None) -> dict | None:
+    """Return the compile manifest of a previous run that is still current.
+
+    Current means every input hash (_input_hashes) and baseline agent hash
+    equals the one recorded in the compile manifest, every recorded artifact
+    still holds its recorded content, and the steps directory holds no other
+    files. Artifacts without a matching local stamp (e.g. a fresh checkout)
+    are hashed, then stamped for the next run. Returns None when anything
+    differs, so the runbook must be prepared again.
+    """
+    _, _, steps_dir, orchestrator_path = derive_paths(runbook_path)
+    manifest_path = orchestrator_path.parent / _MANIFEST_NAME
+    manifest = load_compile_manifest(manifest_path)
+    artifacts = manifest["artifacts"]
+    if not artifacts or manifest["inputs"] != _input_hashes(runbook_path, phase_dir):
+        return None
+    for baseline, digest in manifest["baselines"].items():
+        if _file_hash(baseline) != digest:
+            return None
+    restamp = False
+    for path, recorded in artifacts.items():
+        if _artifact_intact(Path(path), recorded):
+            continue
+        if _file_hash(path) != recorded.get("sha256"):
+            return None
+        restamp = True
+    if any(str(step) not in artifacts for step in steps_dir.glob("*.md")):
+        return None
+    if restamp:
+        stamped = {}
+        for path, recorded in artifacts.items():
+            _record_artifact(stamped, Path(path), recorded)
+        save_artifact_stamps(stamped, manifest_path)
+    return manifest
 
 
 def _build_plan_context_section(
@@ -1115,10 +1979,17 @@ def generate_tdd_agents(
     design_content=None,
     outline_content=None,
     plan_context="",
+    previous=None,
+    artifacts=None,
+    pending=None,
 ) -> list[str]:
     """Generate 4 TDD ping-pong agents: tester, implementer, test-corrector, impl-corrector.
 
-    Returns list of created agent file paths.
+    previous/artifacts are optional compile manifest dicts (see write_artifact).
+    When a pending list is given, agents are queued for flush_artifacts()
+    instead of written.
+
+    Returns list of agent file paths (written or already up to date).
     """
     created = []
     plan_ctx_section = _build_plan_context_section(
@@ -1132,12 +2003,32 @@ def generate_tdd_agents(
             frontmatter + read_baseline_agent(baseline_type) + plan_ctx_section + footer
         )
         agent_file = agents_dir / f"{name}.md"
-        agent_file.write_text(content)
-        print(f"✓ Created agent: {agent_file}")
+        if pending is not None:
+            pending.append((agent_file, content, "agent"))
+        elif write_artifact(agent_file, content, previous, artifacts):
+            print(f"✓ Created agent: {agent_file}")
         created.append(str(agent_file))
     return created
 
 
+@functools.lru_cache(maxsize=4096)
+def _scan_step_metadata(content):
+    """Return (model, report_path, max_turns) as written in a step body.
+
+    Memoized per content: a run asks for the same step's metadata from
+    several places (reference validation, model resolution, step files,
+    orchestrator), and the bodies are scanned once.
+    """
+    model_match = _EXECUTION_MODEL_RE.search(content)
+    report_match = _REPORT_PATH_RE.search(content)
+    max_turns_match = _MAX_TURNS_RE.search(content)
+    return (
+        model_match.group(1).strip().lower() if model_match else None,
+        report_match.group(1).strip() if report_match else None,
+        int(max_turns_match.group(1)) if max_turns_match else None,
+    )
+
+
 def extract_step_metadata(content, default_model=None):
     """Extract execution metadata from step/cycle content.
 
@@ -1149,33 +2040,26 @@ def extract_step_metadata(content, default_model=None):
     """
     valid_models = {"haiku", "sonnet", "opus"}
     metadata = {}
+    model_val, report_path, max_turns = _scan_step_metadata(content)
 
-    # Extract Execution Model (case-insensitive)
-    model_match = re.search(r"\*\*Execution Model\*\*:\s*(\w+)", content, re.IGNORECASE)
-    if model_match:
-        model_val = model_match.group(1).strip().lower()
-        if model_val in valid_models:
-            metadata["model"] = model_val
-        else:
-            print(
-                f"WARNING: Invalid execution model '{model_val}', using default '{default_model}'",
-                file=sys.stderr,
-            )
-            metadata["model"] = default_model
+    # Execution Model (case-insensitive)
+    if model_val is None:
+        metadata["model"] = default_model
+    elif model_val in valid_models:
+        metadata["model"] = model_val
     else:
+        print(
+            f"WARNING: Invalid execution model '{model_val}', using default '{default_model}'",
+            file=sys.stderr,
+        )
         metadata["model"] = default_model
 
-    # Extract Report Path (may have backtick wrapping)
-    report_match = re.search(r"\*\*Report Path\*\*:\s*`?([^`\n]+)`?", content)
-    if report_match:
-        metadata["report_path"] = report_match.group(1).strip()
+    # Report Path (may have backtick wrapping)
+    if report_path is not None:
+        metadata["report_path"] = report_path
 
-    # Extract Max Turns (case-insensitive)
-    max_turns_match = re.search(r"\*\*Max Turns\*\*:\s*(\d+)", content, re.IGNORECASE)
-    if max_turns_match:
-        metadata["max_turns"] = int(max_turns_match.group(1))
-    else:
-        metadata["max_turns"] = _DEFAULT_MAX_TURNS
+    # Max Turns (case-insensitive)
+    metadata["max_turns"] = _DEFAULT_MAX_TURNS if max_turns is None else max_turns
 
     return metadata
 
@@ -1194,11 +2078,21 @@ def extract_file_references(content):
     # Match backtick-wrapped paths containing at least one / (directory separator)
     # and ending with a known file extension. Requires / to avoid matching
     # method names like `utils.json` or `config.py`.
-    file_exts = r"\.(?:py|md|json|sh|txt|toml|yml|yaml|cfg|ini|js|ts|tsx)"
-    matches = re.findall(
-        rf"`([a-zA-Z][a-zA-Z0-9_.\-]*/[a-zA-Z0-9_/.\-]*{file_exts})`", stripped
-    )
-    return set(matches)
+    return set(_FILE_REF_RE.findall(stripped))
+
+
+@functools.lru_cache(maxsize=4096)
+def _scan_file_references(content):
+    """Return (sorted file references, lowercased creation-context paths).
+
+    Memoized per content, so a --watch rebuild rescans only the steps of
+    phases that changed. Creation context is compared lowercased, since its
+    match is case-insensitive.
+    """
+    refs = tuple(sorted(extract_file_references(content)))
+    if not refs:
+        return refs, frozenset()
+    return refs, frozenset(span.lower() for span in _CREATED_REF_RE.findall(content))
 
 
 def validate_file_references(sections, cycles=None, runbook_path=""):
@@ -1227,13 +2121,15 @@ def validate_file_references(sections, cycles=None, runbook_path=""):
 
     # Paths to exclude from validation
     runbook_str = str(runbook_path)
+    # Steps share references; check each path on disk once per run
+    missing = {}
 
     for step_id, content in step_items:
-        refs = extract_file_references(content)
+        refs, created = _scan_file_references(content)
         meta = extract_step_metadata(content)
         report_path = meta.get("report_path", "")
 
-        for ref in sorted(refs):
+        for ref in refs:
             # Skip the runbook itself (Plan reference)
             if ref == runbook_str:
                 continue
@@ -1243,20 +2139,19 @@ def validate_file_references(sections, cycles=None, runbook_path=""):
                 continue
 
             # Skip paths under plans/*/reports/ (always created)
-            if re.match(r"plans/[^/]+/reports/", ref):
+            if _REPORTS_DIR_RE.match(ref):
                 continue
 
             # Skip paths preceded by creation-verb context
-            create_pattern = r"(?:Create|Write|mkdir)[^`]*`" + re.escape(ref) + r"`"
-            if re.search(create_pattern, content, re.IGNORECASE):
-                continue
-
-            # Skip paths whose parent directory doesn't exist (greenfield)
-            if not Path(ref).parent.exists():
+            if ref.lower() in created:
                 continue
 
-            # Check existence
-            if not Path(ref).exists():
+            # Skip paths whose parent directory doesn't exist (greenfield),
+            # else check existence
+            if ref not in missing:
+                path = Path(ref)
+                missing[ref] = path.parent.exists() and not path.exists()
+            if missing[ref]:
                 warnings.append(
                     f"WARNING: {step_id} references non-existent file: {ref}"
                 )
@@ -1354,7 +2249,7 @@ def split_cycle_content(content):
     bootstrap_idx = content.find(bootstrap_marker)
     if bootstrap_idx != -1:
         # Find --- separator between Bootstrap and RED
-        separator_pattern = re.search(r"\n---\s*\n", content[bootstrap_idx:])
+        separator_pattern = _BOOTSTRAP_SEPARATOR_RE.search(content[bootstrap_idx:])
         if separator_pattern:
             abs_sep_start = bootstrap_idx + separator_pattern.start()
             abs_sep_end = bootstrap_idx + separator_pattern.end()
@@ -1597,8 +2492,18 @@ def validate_and_create(
     phase_models=None,
     phase_preambles=None,
     phase_dir=None,
+    staged_paths=None,
+    stats=None,
+    printed_warnings=None,
 ) -> bool:
-    """Validate and create all output files."""
+    """Validate and create all output files.
+
+    Generated artifacts are staged with git add, unless a staged_paths list
+    is given: paths are then appended to it for the caller to stage (one git
+    add for a whole batch of runbooks). stats: optional new_stats() dict.
+    printed_warnings: the run's WARNING: lines so far, recorded in the
+    compile manifest for up-to-date reruns to repeat.
+    """
     runbook_type = metadata.get("type", "general")
     has_inline = bool(sections.get("inline_phases"))
 
@@ -1665,22 +2570,19 @@ def validate_and_create(
         for item in unresolved:
             print(f"ERROR: No model specified for {item}", file=sys.stderr)
         return False
+    _end_stage(stats, "validate")
 
     # Create directories
     agents_dir.mkdir(parents=True, exist_ok=True)
     steps_dir.mkdir(parents=True, exist_ok=True)
 
-    # Clean steps directory to prevent orphaned files from previous runs
-    if steps_dir.exists():
-        for step_file in steps_dir.glob("*.md"):
-            step_file.unlink()
-
-    # Verify writable
-    try:
-        agents_dir.touch(exist_ok=True)
-        steps_dir.touch(exist_ok=True)
-    except OSError, IsADirectoryError:
-        pass
+    # Artifacts from the previous run; unchanged files are left untouched and
+    # orphaned step files are removed once all artifacts are generated
+    manifest_path = orchestrator_path.parent / _MANIFEST_NAME
+    previous = load_compile_manifest(manifest_path)["artifacts"]
+    artifacts = {}
+    # Rendered artifacts (path, content, label), written by flush_artifacts()
+    pending = []
 
     model = metadata.get("model")
 
@@ -1756,8 +2658,7 @@ def validate_and_create(
             model=model,
         )
         agent_file = agents_dir / f"{task_agent_name}.md"
-        agent_file.write_text(agent_content)
-        print(f"✓ Created agent: {agent_file}")
+        pending.append((agent_file, agent_content, "agent"))
         created_agents.append(str(agent_file))
 
     non_inline_count = sum(1 for t in phase_types.values() if t != "inline")
@@ -1769,8 +2670,7 @@ def validate_and_create(
             plan_context=plan_context,
         )
         corrector_file = agents_dir / f"{runbook_name}-corrector.md"
-        corrector_file.write_text(corrector_content)
-        print(f"✓ Created agent: {corrector_file}")
+        pending.append((corrector_file, corrector_content, "agent"))
         created_agents.append(str(corrector_file))
 
     has_tdd_phase = any(t == "tdd" for t in phase_types.values())
@@ -1781,6 +2681,7 @@ def validate_and_create(
             design_content=design_content,
             outline_content=outline_content,
             plan_context=plan_context,
+            pending=pending,
         )
         created_agents.extend(tdd_files)
 
@@ -1792,6 +2693,7 @@ def validate_and_create(
         else:
             phase_agents[phase_num] = task_agent_name
 
+    @functools.cache
     def _source_for_phase(phase_num: int) -> str:
         """Resolve provenance path to actual phase file or canonical runbook."""
         if phase_dir:
@@ -1809,36 +2711,45 @@ def validate_and_create(
             )
             base = f"step-{cycle['major']}-{cycle['minor']}"
 
-            # Write bootstrap file if Bootstrap section present
+            # Bootstrap file if Bootstrap section present
             if bootstrap_content:
                 bootstrap_cycle = {**cycle, "content": bootstrap_content}
-                bootstrap_path = steps_dir / f"{base}-bootstrap.md"
-                bootstrap_path.write_text(
-                    generate_cycle_file(
-                        bootstrap_cycle, source_path, cycle_model, phase_context=pctx
+                pending.append(
+                    (
+                        steps_dir / f"{base}-bootstrap.md",
+                        generate_cycle_file(
+                            bootstrap_cycle,
+                            source_path,
+                            cycle_model,
+                            phase_context=pctx,
+                        ),
+                        "step",
                     )
                 )
-                print(f"✓ Created step: {bootstrap_path}")
 
-            # Write test file (RED phase content)
+            # Test file (RED phase content)
             red_cycle = {**cycle, "content": red_content}
-            test_path = steps_dir / f"{base}-test.md"
-            test_path.write_text(
-                generate_cycle_file(
-                    red_cycle, source_path, cycle_model, phase_context=pctx
+            pending.append(
+                (
+                    steps_dir / f"{base}-test.md",
+                    generate_cycle_file(
+                        red_cycle, source_path, cycle_model, phase_context=pctx
+                    ),
+                    "step",
                 )
             )
-            print(f"✓ Created step: {test_path}")
 
-            # Write impl file (GREEN phase content)
+            # Impl file (GREEN phase content)
             green_cycle = {**cycle, "content": green_content}
-            impl_path = steps_dir / f"{base}-impl.md"
-            impl_path.write_text(
-                generate_cycle_file(
-                    green_cycle, source_path, cycle_model, phase_context=pctx
+            pending.append(
+                (
+                    steps_dir / f"{base}-impl.md",
+                    generate_cycle_file(
+                        green_cycle, source_path, cycle_model, phase_context=pctx
+                    ),
+                    "step",
                 )
             )
-            print(f"✓ Created step: {impl_path}")
 
     # Generate step files for general steps
     if sections["steps"]:
@@ -1860,8 +2771,7 @@ def validate_and_create(
                 phase,
                 phase_context=preambles.get(phase, ""),
             )
-            step_path.write_text(step_file_content)
-            print(f"✓ Created step: {step_path}")
+            pending.append((step_path, step_file_content, "step"))
 
     # Generate orchestrator plan
     if sections["orchestrator"]:
@@ -1881,8 +2791,36 @@ def validate_and_create(
             phase_preambles=preambles,
         )
 
-    orchestrator_path.write_text(orchestrator_content)
-    print(f"✓ Created orchestrator: {orchestrator_path}")
+    pending.append((orchestrator_path, orchestrator_content, "orchestrator"))
+    _end_stage(stats, "render")
+
+    for path, label in flush_artifacts(pending, previous, artifacts):
+        print(f"✓ Created {label}: {path}")
+
+    # Remove step files orphaned by renumbered or deleted steps/cycles
+    for step_file in sorted(steps_dir.glob("*.md")):
+        if str(step_file) not in artifacts:
+            step_file.unlink()
+            print(f"✓ Removed stale step: {step_file}")
+
+    unchanged = sum(
+        1
+        for key, entry in artifacts.items()
+        if (previous.get(key) or {}).get("sha256") == entry["sha256"]
+    )
+    save_compile_manifest(
+        {
+            "version": _MANIFEST_VERSION,
+            "inputs": _input_hashes(runbook_path, phase_dir),
+            "baselines": {
+                path: _file_hash(path) for path, _mtime in sorted(_BASELINE_CACHE)
+            },
+            "artifacts": artifacts,
+            "warnings": list(printed_warnings or []),
+        },
+        manifest_path,
+    )
+    _end_stage(stats, "write")
 
     # Summary
     print("\nSummary:")
@@ -1891,57 +2829,99 @@ def validate_and_create(
     total_steps = len(cycles or []) + len(sections["steps"])
     print(f"  Steps: {total_steps}")
     print(f"  Model: {model}")
+    print(f"  Unchanged artifacts: {unchanged}/{len(artifacts)}")
 
     # Stage all generated artifacts
-    paths_to_stage = [*created_agents, str(steps_dir), str(orchestrator_path)]
+    paths_to_stage = [
+        *created_agents,
+        str(steps_dir),
+        str(orchestrator_path),
+        str(manifest_path),
+    ]
+    return stage_artifacts(paths_to_stage, staged_paths, stats)
+
+
+def stage_artifacts(paths_to_stage, staged_paths=None, stats=None) -> bool:
+    """git add generated artifacts, or append them to staged_paths if given."""
+    if staged_paths is not None:
+        staged_paths.extend(paths_to_stage)
+        return True
     result = subprocess.run(
         ["git", "add", *paths_to_stage], check=False, capture_output=True, text=True
     )
+    _end_stage(stats, "git add")
     if result.returncode != 0:
         print(f"⚠ git add failed: {result.stderr.strip()}")
         return False
     print("✓ Staged artifacts for commit")
-
     return True
 
 
-def main() -> None:
-    if len(sys.argv) < 2:
-        print(
-            "Usage: prepare-runbook.py <runbook-file.md> OR <directory-with-phase-files>",
-            file=sys.stderr,
-        )
-        print(file=sys.stderr)
-        print("Transforms runbook markdown into execution artifacts:", file=sys.stderr)
-        print(
-            "  - Plan-specific agents (.claude/agents/<name>-task.md, <name>-corrector.md)",
-            file=sys.stderr,
-        )
-        print("  - Step/Cycle files (plans/<runbook-name>/steps/)", file=sys.stderr)
-        print(
-            "  - Orchestrator plan (plans/<runbook-name>/orchestrator-plan.md)",
-            file=sys.stderr,
-        )
-        print(file=sys.stderr)
-        print("Supports:", file=sys.stderr)
-        print("  - General runbooks (## Step N:)", file=sys.stderr)
-        print(
-            "  - TDD runbooks (## Cycle X.Y:, requires type: tdd in frontmatter)",
-            file=sys.stderr,
-        )
-        print(
-            "  - Phase-grouped runbooks (runbook-phase-*.md files in directory)",
-            file=sys.stderr,
+@contextlib.contextmanager
+def _tee_warnings(warnings):
+    """Collect the WARNING: lines written to stderr into warnings.
+
+    The lines are still written to stderr as they come.
+    """
+    stderr = sys.stderr
+
+    def write(text):
+        warnings.extend(
+            line for line in text.splitlines() if line.startswith("WARNING:")
         )
-        sys.exit(1)
+        return stderr.write(text)
 
-    input_path = Path(sys.argv[1])
+    tee = types.SimpleNamespace(write=write, flush=stderr.flush)
+    with contextlib.redirect_stderr(tee):
+        yield
+
+
+def prepare_runbook(input_path, staged_paths=None, force=False, stats=None) -> None:
+    """Prepare artifacts for one runbook file or phase directory.
+
+    Exits with status 1 (after printing errors) if the runbook is invalid.
+    Unless force, returns early when the previous run's artifacts are still
+    current (check_up_to_date()), repeating the warnings that run printed.
+    staged_paths: see validate_and_create(). stats: optional new_stats() dict
+    filled in for --stats.
+    """
 
     # Validate input exists
     if not input_path.exists():
         print(f"ERROR: Path not found: {input_path}", file=sys.stderr)
         sys.exit(1)
 
+    # Skip everything when no input changed since the last run
+    if not force:
+        if input_path.is_dir():
+            runbook_path, phase_dir = input_path / "runbook.md", str(input_path)
+        else:
+            runbook_path, phase_dir = input_path, None
+        manifest = check_up_to_date(runbook_path, phase_dir)
+        if manifest is not None:
+            for warning in manifest["warnings"]:
+                print(warning, file=sys.stderr)
+            current = sorted(manifest["artifacts"])
+            print(f"✓ Up to date: {input_path} (inputs unchanged since last run)")
+            print(f"  Unchanged artifacts: {len(current)}/{len(current)}")
+            _end_stage(stats, "read")
+            manifest_path = derive_paths(runbook_path)[3].parent / _MANIFEST_NAME
+            if not stage_artifacts(
+                [*current, str(manifest_path)], staged_paths, stats
+            ):
+                sys.exit(1)
+            return
+
+    printed_warnings = []
+    with _tee_warnings(printed_warnings):
+        _build_runbook(input_path, staged_paths, stats, printed_warnings)
+
+
+def _build_runbook(input_path, staged_paths, stats, printed_warnings) -> None:
+    """Assemble, validate and generate a runbook (prepare_runbook() body).
+
+    printed_warnings: the WARNING: lines printed so far (see _tee_warnings()).
+    """
     # Handle directory vs file input
     if input_path.is_dir():
         # Try to assemble from phase files
@@ -1964,6 +2944,8 @@ def main() -> None:
         runbook_path = input_path
         content = runbook_path.read_text()
 
+    _end_stage(stats, "read")
+
     # Parse runbook
     metadata, body = parse_frontmatter(content)
 
@@ -1986,6 +2968,8 @@ def main() -> None:
     elif not has_steps and not has_inline:
         metadata["type"] = metadata.get("type", "general")
 
+    _end_stage(stats, "parse")
+
     # Validate cycles if present
     if has_cycles:
         errors, warnings = validate_cycle_numbering(cycles)
@@ -1998,13 +2982,11 @@ def main() -> None:
 
         # Build validation context from Common Context + phase preambles
         common_parts = []
-        common_match = re.search(
-            r"## Common Context\s*\n(.*?)(?=\n## |\Z)", body, re.DOTALL
-        )
+        common_match = _COMMON_CONTEXT_RE.search(body)
         if common_match:
             common_parts.append(common_match.group(1))
         # Phase preambles (text between ### Phase N: and first ## child)
-        for m in re.finditer(r"### Phase\s+\d+:.*?\n(.*?)(?=\n## )", body, re.DOTALL):
+        for m in _PHASE_PREAMBLE_RE.finditer(body):
             common_parts.append(m.group(1))
         common_context = "\n".join(common_parts)
 
@@ -2037,9 +3019,11 @@ def main() -> None:
     phase_models = extract_phase_models(body)
     phase_preambles = extract_phase_preambles(body)
 
+    _end_stage(stats, "validate")
+
     # Resolve recall artifact (FR-1/2/3/4, NFR-2/3)
     phase_types = detect_phase_types(body)
-    recall_result = resolve_recall_for_runbook(runbook_path, phase_types)
+    recall_result = resolve_recall_for_runbook(runbook_path, phase_types, stats)
     if recall_result is None:
         sys.exit(1)
     shared_recall, phase_recall = recall_result
@@ -2056,6 +3040,8 @@ def main() -> None:
             current + "\n\n## Phase Recall\n\n" + recall_content
         )
 
+    _end_stage(stats, "recall")
+
     # Validate and create
     phase_dir = str(input_path) if input_path.is_dir() else None
     if not validate_and_create(
@@ -2070,9 +3056,313 @@ def main() -> None:
         phase_models,
         phase_preambles,
         phase_dir=phase_dir,
+        staged_paths=staged_paths,
+        stats=stats,
+        printed_warnings=printed_warnings,
     ):
         sys.exit(1)
 
 
+def print_stats(stats) -> None:
+    """Print recall cache counters and per-stage timings (--stats)."""
+    print("\nStats:")
+    print(
+        f"  Recall cache: {stats['recall_hits']} hits, "
+        f"{stats['recall_misses']} misses"
+    )
+    print("  Stage timings:")
+    for stage, seconds in stats["stages"].items():
+        print(f"    {stage}: {seconds * 1000:.1f} ms")
+
+
+def _watch_stamps(input_path) -> dict:
+    """Return {path: (mtime_ns, size) or None} for a runbook's build inputs.
+
+    Covers _input_paths() and the baseline agents; a missing file stamps as
+    None, so creating one (e.g. design.md) triggers a rebuild too.
+    """
+    if input_path.is_dir():
+        paths = _input_paths(input_path / "runbook.md", input_path)
+    else:
+        paths = _input_paths(input_path)
+    stamps = {}
+    for path in [*paths, *_BASELINE_AGENTS.values()]:
+        try:
+            st = path.stat()
+        except OSError:
+            stamps[str(path)] = None
+            continue
+        stamps[str(path)] = (st.st_mtime_ns, st.st_size)
+    return stamps
+
+
+def _rebuild(input_path, show_stats, reason) -> list | None:
+    """Run one --watch build; return its artifact paths, or None if it failed.
+
+    Nothing is staged here (see watch_runbook()). Errors stream to stderr,
+    the status line to stdout.
+    """
+    stats = new_stats()
+    start = stats["mark"]
+    staged_paths = []
+    try:
+        prepare_runbook(input_path, staged_paths=staged_paths, stats=stats)
+        ok = True
+    except SystemExit as e:
+        ok = e.code in (None, 0)
+    except Exception:
+        traceback.print_exc()
+        ok = False
+    if ok and show_stats:
+        print_stats(stats)
+    elapsed = (time.perf_counter() - start) * 1000
+    mark = "✓ Rebuilt" if ok else "✗ Build failed"
+    print(f"[{time.strftime('%H:%M:%S')}] {mark} in {elapsed:.0f} ms ({reason})")
+    sys.stdout.flush()
+    return staged_paths if ok else None
+
+
+def watch_runbook(input_path, show_stats=False) -> None:
+    """Rebuild a runbook whenever its source files change, until Ctrl-C.
+
+    Polls file stamps (_watch_stamps(); stdlib only, no inotify dependency).
+    A change starts a debounce: the rebuild waits until the stamps hold still
+    for _WATCH_DEBOUNCE_SECONDS, so an editor's burst of writes triggers one
+    build. Builds run in this process and keep its caches warm: unchanged
+    phase files are not re-read (_scan_phase_file), the per-step scans and
+    renders of unchanged phases are served from their content-keyed memos,
+    baseline agents and recall stay cached, and the compile manifest skips
+    rewriting artifacts whose content did not change, so only the edited
+    phase's step files are written. Rebuilds are not staged; the artifacts
+    of the last successful build get one git add when watching stops.
+    """
+    stamps = _watch_stamps(input_path)
+    to_stage = _rebuild(input_path, show_stats, "initial build")
+    print(f"Watching {input_path} for changes (Ctrl-C to stop)")
+    sys.stdout.flush()
+    try:
+        while True:
+            time.sleep(_WATCH_POLL_SECONDS)
+            current = _watch_stamps(input_path)
+            if current == stamps:
+                continue
+            while True:
+                time.sleep(_WATCH_DEBOUNCE_SECONDS)
+                settled = _watch_stamps(input_path)
+                if settled == current:
+                    break
+                current = settled
+            changed = sorted(
+                Path(path).name
+                for path in current.keys() | stamps.keys()
+                if current.get(path) != stamps.get(path)
+            )
+            stamps = current
+            built = _rebuild(input_path, show_stats, "changed: " + ", ".join(changed))
+            if built is not None:
+                to_stage = built
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    if to_stage:
+        stage_artifacts(to_stage)
+
+
+def discover_runbooks(root) -> list[str]:
+    """Find preparable runbooks under root.
+
+    A directory with runbook-phase-*.md files is one phase-grouped runbook;
+    otherwise its runbook.md, if any, is a single-file runbook.
+    """
+    root = Path(root)
+    directories = {path.parent for path in root.rglob("runbook.md")}
+    directories |= {path.parent for path in root.rglob("runbook-phase-*.md")}
+    targets = []
+    for directory in sorted(directories):
+        if any(directory.glob("runbook-phase-*.md")):
+            targets.append(f"{directory}/")
+        else:
+            targets.append(str(directory / "runbook.md"))
+    return targets
+
+
+def _prepare_isolated(target, show_stats, force=False):
+    """Prepare one runbook in a worker process with captured output.
+
+    Returns (target, exit code, stdout, stderr, paths to stage).
+    """
+    stats = new_stats()
+    _BASELINE_CACHE.clear()  # manifest records only this plan's baselines
+    staged_paths = []
+    out, err = io.StringIO(), io.StringIO()
+    code = 0
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            prepare_runbook(
+                Path(target), staged_paths=staged_paths, force=force, stats=stats
+            )
+            if show_stats:
+                print_stats(stats)
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 1
+        except Exception:
+            traceback.print_exc()
+            code = 1
+    return target, code, out.getvalue(), err.getvalue(), staged_paths
+
+
+def prepare_many(targets, jobs=None, show_stats=False, force=False) -> int:
+    """Prepare several runbooks in a process pool; return combined exit status.
+
+    Each runbook runs isolated in a worker: a failing plan does not stop the
+    others. Output is replayed per plan in input order, artifacts of all
+    successful plans are staged with one git add, and a pass/fail summary is
+    printed.
+    """
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            pool.submit(_prepare_isolated, target, show_stats, force)
+            for target in targets
+        ]
+        for future in futures:
+            target, code, out, err, staged = future.result()
+            print(f"\n=== {target}")
+            sys.stdout.write(out)
+            sys.stdout.flush()
+            sys.stderr.write(err)
+            sys.stderr.flush()
+            results.append((target, code, staged))
+
+    staged_paths = [path for _, code, staged in results if code == 0 for path in staged]
+    stage_failed = False
+    if staged_paths:
+        result = subprocess.run(
+            ["git", "add", *staged_paths], check=False, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            print(f"⚠ git add failed: {result.stderr.strip()}")
+            stage_failed = True
+        else:
+            print("\n✓ Staged artifacts for commit")
+
+    passed = sum(1 for _, code, _ in results if code == 0)
+    print(f"\nBatch summary: {passed} passed, {len(results) - passed} failed")
+    for target, code, _ in results:
+        mark = "✓" if code == 0 else "✗"
+        suffix = "" if code == 0 else f" (exit {code})"
+        print(f"  {mark} {target}{suffix}")
+    return 1 if stage_failed or passed < len(results) else 0
+
+
+def main() -> None:
+    stats = new_stats()
+    show_stats = "--stats" in sys.argv
+    watch = "--watch" in sys.argv
+    force = "--force" in sys.argv
+    args = [
+        arg for arg in sys.argv[1:] if arg not in ("--stats", "--watch", "--force")
+    ]
+    jobs = None
+    if "--jobs" in args:
+        i = args.index("--jobs")
+        try:
+            jobs = int(args[i + 1])
+        except IndexError, ValueError:
+            jobs = 0
+        if jobs < 1:
+            print("ERROR: --jobs requires a positive integer", file=sys.stderr)
+            sys.exit(1)
+        del args[i : i + 2]
+    batch_root = None
+    if "--all" in args:
+        i = args.index("--all")
+        if i + 1 >= len(args):
+            print("ERROR: --all requires a directory", file=sys.stderr)
+            sys.exit(1)
+        batch_root = Path(args[i + 1])
+        del args[i : i + 2]
+    if not args and batch_root is None:
+        print(
+            "Usage: prepare-runbook.py [--stats] <runbook-file.md> OR <directory-with-phase-files>",
+            file=sys.stderr,
+        )
+        print(
+            "       prepare-runbook.py [--stats] [--jobs N] --all <plans-dir> | <path>...",
+            file=sys.stderr,
+        )
+        print(
+            "       prepare-runbook.py [--stats] --watch <runbook-file.md> | <directory>",
+            file=sys.stderr,
+        )
+        print(file=sys.stderr)
+        print("Transforms runbook markdown into execution artifacts:", file=sys.stderr)
+        print(
+            "  - Plan-specific agents (.claude/agents/<name>-task.md, <name>-corrector.md)",
+            file=sys.stderr,
+        )
+        print("  - Step/Cycle files (plans/<runbook-name>/steps/)", file=sys.stderr)
+        print(
+            "  - Orchestrator plan (plans/<runbook-name>/orchestrator-plan.md)",
+            file=sys.stderr,
+        )
+        print(file=sys.stderr)
+        print("Supports:", file=sys.stderr)
+        print("  - General runbooks (## Step N:)", file=sys.stderr)
+        print(
+            "  - TDD runbooks (## Cycle X.Y:, requires type: tdd in frontmatter)",
+            file=sys.stderr,
+        )
+        print(
+            "  - Phase-grouped runbooks (runbook-phase-*.md files in directory)",
+            file=sys.stderr,
+        )
+        print(file=sys.stderr)
+        print("Options:", file=sys.stderr)
+        print(
+            "  --stats  Print recall cache counters and per-stage timings",
+            file=sys.stderr,
+        )
+        print(
+            "  --all    Prepare every runbook.md / phase directory under a directory",
+            file=sys.stderr,
+        )
+        print(
+            "  --jobs   Worker processes for multi-runbook mode (default: CPU count)",
+            file=sys.stderr,
+        )
+        print(
+            "  --watch  Rebuild whenever the runbook or its phase files change",
+            file=sys.stderr,
+        )
+        print(
+            "  --force  Regenerate even if no input changed since the last run",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    if watch:
+        if batch_root is not None or len(args) > 1:
+            print("ERROR: --watch takes a single runbook", file=sys.stderr)
+            sys.exit(1)
+        watch_runbook(Path(args[0]), show_stats=show_stats)
+        return
+
+    if batch_root is not None or len(args) > 1:
+        targets = list(args)
+        if batch_root is not None:
+            if not batch_root.is_dir():
+                print(f"ERROR: Not a directory: {batch_root}", file=sys.stderr)
+                sys.exit(1)
+            targets.extend(discover_runbooks(batch_root))
+        if not targets:
+            print(f"ERROR: No runbooks found under {batch_root}", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(prepare_many(targets, jobs=jobs, show_stats=show_stats, force=force))
+
+    prepare_runbook(Path(args[0]), force=force, stats=stats)
+    if show_stats:
+        print_stats(stats)
+
+
 if __name__ == "__main__":
     main()
@@ -4,6 +4,7 @@
 Idempotent: deduplicates by command string. Preserves existing hooks.
 """
 
+import importlib.util
 import json
 import os
 import sys
@@ -39,6 +40,12 @@ def load_json(path):
         sys.exit(1)
 
 
+# Consolidated dispatchers: script → scripts it replaces in the same matcher entry
+SUPERSEDED = {
+    "pretooluse-bash.py": {"submodule-safety.py", "pretooluse-recipe-redirect.py"},
+}
+
+
 def get_command_string(hook_entry):
     """Extract command string from hook entry for dedup comparison."""
     if isinstance(hook_entry, dict) and hook_entry.get("type") == "command":
@@ -51,10 +58,16 @@ def normalize_command(cmd):
 
     Strips interpreter prefixes (python3, bash) and $CLAUDE_PROJECT_DIR/ so that
     'python3 $CLAUDE_PROJECT_DIR/plugin/hooks/foo.py' matches 'agent-
-    core/hooks/foo.py'.
+    core/hooks/foo.py'. Unwraps the hook-client.sh shim so that
+    'plugin/hooks/hook-client.sh foo.py' and the socket-guarded form
+    '[ -S ... ] && exec ".../hook-client.sh" foo.py || exec ".../foo.py"'
+    match 'plugin/hooks/foo.py'.
     """
     if cmd is None:
         return None
+    # Socket-guarded hook server shim: the direct command follows "|| exec"
+    if " || exec " in cmd:
+        cmd = cmd.rsplit(" || exec ", 1)[1].replace('"', "")
     # Strip interpreter prefix
     for prefix in ("python3 ", "bash "):
         if cmd.startswith(prefix):
@@ -62,17 +75,37 @@ def normalize_command(cmd):
             break
     # Strip $CLAUDE_PROJECT_DIR/
     cmd = cmd.replace("$CLAUDE_PROJECT_DIR/", "")
+    # Unwrap hook server client shim
+    shim, sep, script = cmd.partition(" ")
+    if sep and shim.endswith("hook-client.sh"):
+        cmd = shim.removesuffix("hook-client.sh") + script
     return cmd
 
 
+def script_name(cmd):
+    """Return hook script filename of a command, or None."""
+    norm = normalize_command(cmd)
+    if norm is None:
+        return None
+    return norm.rsplit("/", 1)[-1]
+
+
 def _merge_hook_entries(existing_entry, new_entry):
     """Merge new hooks into existing entry, replacing old-form commands.
 
     Uses normalized comparison so 'plugin/hooks/foo.py' is recognized as
     equivalent to 'python3 $CLAUDE_PROJECT_DIR/plugin/hooks/foo.py'. When
-    matched, the old-form entry is replaced with the new-form entry.
+    matched, the old-form entry is replaced with the new-form entry. Hooks
+    folded into a consolidated dispatcher (SUPERSEDED) are dropped.
     """
     existing_hooks = existing_entry.get("hooks", [])
+    for new_hook in new_entry.get("hooks", []):
+        superseded = SUPERSEDED.get(script_name(get_command_string(new_hook)), ())
+        existing_hooks[:] = [
+            h
+            for h in existing_hooks
+            if script_name(get_command_string(h)) not in superseded
+        ]
     existing_normalized = {
         normalize_command(get_command_string(h)): i
         for i, h in enumerate(existing_hooks)
@@ -148,6 +181,22 @@ def write_json(path, data) -> None:
         sys.exit(1)
 
 
+def refresh_manifest(plugin_root) -> None:
+    """Recompile <plugin>/.edify-manifest.json; warn and continue on failure.
+
+    Consumers fall back to parsing markdown when the manifest is stale.
+    """
+    try:
+        spec = importlib.util.spec_from_file_location(
+            "compile_manifest", plugin_root / "bin" / "compile-manifest.py"
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.write_manifest(plugin_root)
+    except Exception as e:
+        print(f"Warning: manifest not refreshed: {e}", file=sys.stderr)
+
+
 def main() -> None:
     settings_path = find_settings_path()
     hooks_path = find_hooks_path()
@@ -158,6 +207,8 @@ def main() -> None:
     merged = merge_hooks(settings, hooks_config)
     write_json(settings_path, merged)
 
+    refresh_manifest(hooks_path.parent.parent)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env bash
+# Hook client shim: forward a Python hook to the resident hook server.
+#
+# Usage (hooks.json): $CLAUDE_PLUGIN_ROOT/hooks/hook-client.sh <hook-script>
+#
+# hooks.json only routes through this shim while the server socket exists;
+# otherwise its command execs the hook script directly (no bash hop).
+#
+# When hook-server.py is listening, sends hook name, cwd, environment and
+# stdin JSON over its Unix socket and relays stdout, stderr and exit code.
+# Without a server (or nc, or on any protocol failure) runs the hook directly.
+
+set -uo pipefail
+
+hook="$1"
+hooks_dir="${0%/*}"
+[[ "$hooks_dir" = /* ]] || hooks_dir="$PWD/$hooks_dir"
+sock="${TMPDIR:-/tmp}/edify-hooks-${USER:-}.sock"
+
+# Socket must be ours: never hand hook input to another user's listener
+if [ ! -S "$sock" ] || [ ! -O "$sock" ] || ! command -v nc > /dev/null 2>&1; then
+    exec "$hooks_dir/$hook"
+fi
+
+input=$(cat)
+
+code="" out="" err=""
+{
+    IFS= read -r -d '' code
+    IFS= read -r -d '' out
+    IFS= read -r -d '' err
+} < <(printf '%s\n%s\n%s\n%s\n%s\n%s\0' \
+    "$hook" "$hooks_dir" "$PWD" "${CLAUDE_PROJECT_DIR:-}" "${HOME:-}" "$input" \
+    | nc -U "$sock" 2> /dev/null)
+
+if ! [[ "$code" =~ ^[0-9]+$ ]]; then
+    printf '%s\n' "$input" | "$hooks_dir/$hook"
+    exit $?
+fi
+
+printf '%s' "$out"
+printf '%s' "$err" >&2
+exit "$code"
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""Resident hook server: run Python hooks without per-event interpreter startup.
+
+Preloads the Python hooks in HOOKS and serves them over a Unix socket.
+hooks/hook-client.sh forwards each hook invocation (hook name, cwd,
+environment, stdin JSON) and relays stdout, stderr and exit code. When the
+server is not running the client executes the hook script directly, so the
+server is purely an optimization.
+
+Usage:
+    hook-server.py start     # Start in background (no-op if running)
+    hook-server.py serve     # Run in foreground
+    hook-server.py stop
+    hook-server.py status
+
+Protocol (one request per connection):
+    request:  hook, hooks dir, cwd, CLAUDE_PROJECT_DIR, HOME (one per line),
+              then stdin JSON, terminated by NUL
+    response: exit code, stdout, stderr (each terminated by NUL)
+
+An exit code of "-" tells the client to run the hook itself (unknown hook,
+hooks dir from another plugin install, unusable cwd).
+
+Each connection is served by a child forked from the preloaded server, so
+requests run concurrently, a slow hook does not block others, and a hook's
+chdir/environment changes end with its child. Hooks are reloaded (in the
+server, before forking) when their source file changes. Socket I/O gives up
+after REQUEST_TIMEOUT seconds, below the 5 s hook timeout in hooks.json, so
+the client can still fall back to running the hook itself. The server exits
+after IDLE_TIMEOUT seconds without requests.
+"""
+
+import contextlib
+import importlib.util
+import io
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import traceback
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parent
+HOOKS = (
+    "pretooluse-bash.py",
+    "submodule-safety.py",
+    "pretooluse-recipe-redirect.py",
+    "pretooluse-recall-check.py",
+    "userpromptsubmit-shortcuts.py",
+)
+IDLE_TIMEOUT = 3600
+REQUEST_TIMEOUT = 3
+
+# Environment variables hooks read at call time; taken from the client
+FORWARDED_ENV = ("CLAUDE_PROJECT_DIR", "HOME")
+
+FALLBACK = b"-\0\0\0"
+
+_loaded = {}
+
+
+def socket_path() -> Path:
+    """Return socket path shared with hooks.json and hook-client.sh.
+
+    ${TMPDIR:-/tmp}/edify-hooks-$USER.sock: expandable by the POSIX shell
+    hooks.json commands run in, which has no $UID.
+    """
+    tmpdir = os.environ.get("TMPDIR") or "/tmp"
+    return Path(tmpdir) / f"edify-hooks-{os.environ.get('USER', '')}.sock"
+
+
+def load_hook(name):
+    """Return hook module, (re)loading it when any hook source changed.
+
+    Keyed on all HOOKS mtimes: pretooluse-bash.py imports sibling hooks.
+    """
+    path = HOOKS_DIR / name
+    mtime = tuple((HOOKS_DIR / hook).stat().st_mtime_ns for hook in HOOKS)
+    cached = _loaded.get(name)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    module_name = "hook_" + path.stem.replace("-", "_")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _loaded[name] = (mtime, module)
+    return module
+
+
+def run_hook(module, stdin_text):
+    """Run module.main() with captured stdio; return (code, stdout, stderr)."""
+    out, err = io.StringIO(), io.StringIO()
+    saved_stdin = sys.stdin
+    sys.stdin = io.StringIO(stdin_text)
+    code = 0
+    try:
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                module.main()
+            except SystemExit as e:
+                if e.code is None:
+                    code = 0
+                elif isinstance(e.code, int):
+                    code = e.code
+                else:
+                    print(e.code, file=sys.stderr)
+                    code = 1
+            except Exception:
+                traceback.print_exc()
+                code = 1
+    finally:
+        sys.stdin = saved_stdin
+    return code, out.getvalue(), err.getvalue()
+
+
+def handle_request(data):
+    """Dispatch one request; return (response bytes, keep serving).
+
+    Runs in a per-connection child: cwd and environment changes are not
+    restored.
+    """
+    try:
+        fields = data.decode().split("\n", 5)
+        hook, hooks_dir, cwd, project_dir, home, stdin_text = fields
+    except (UnicodeDecodeError, ValueError):
+        return FALLBACK, True
+
+    if hook == "__ping__":
+        return f"0\0{os.getppid()}\n\0\0".encode(), True
+    if hook == "__stop__":
+        return b"0\0\0\0", False
+    if hook not in HOOKS or Path(hooks_dir).resolve() != HOOKS_DIR:
+        return FALLBACK, True
+
+    try:
+        os.chdir(cwd)
+    except OSError:
+        return FALLBACK, True
+    for key, value in zip(FORWARDED_ENV, (project_dir, home), strict=True):
+        if value:
+            os.environ[key] = value
+        else:
+            os.environ.pop(key, None)
+    try:
+        module = load_hook(hook)
+    except Exception:
+        return FALLBACK, True
+    code, stdout, stderr = run_hook(module, stdin_text)
+    return f"{code}\0{stdout}\0{stderr}\0".encode(), True
+
+
+def serve_connection(conn) -> None:
+    """Serve one connection in a forked child, then exit the child."""
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)  # hooks wait on subprocesses
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    serving = True
+    try:
+        conn.settimeout(REQUEST_TIMEOUT)
+        response, serving = handle_request(receive(conn))
+        conn.sendall(response)
+    except Exception:
+        pass
+    finally:
+        conn.close()
+        if not serving:
+            os.kill(os.getppid(), signal.SIGTERM)
+        os._exit(0)
+
+
+def refresh_hooks() -> None:
+    """Reload changed hooks in the server, so children inherit them loaded."""
+    for name in HOOKS:
+        try:
+            load_hook(name)
+        except Exception:
+            continue  # broken hook source: the child falls back to the client
+
+
+def receive(conn):
+    """Read one NUL-terminated request from conn."""
+    chunks = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.endswith(b"\0"):
+            break
+    return b"".join(chunks).removesuffix(b"\0")
+
+
+def send_request(hook, timeout=2.0):
+    """Send a control request to a running server; return stdout or None."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(timeout)
+            conn.connect(str(socket_path()))
+            conn.sendall(f"{hook}\n\n\n\n\n\0".encode())
+            chunks = []
+            while True:
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        return None
+    parts = b"".join(chunks).split(b"\0")
+    return parts[1].decode() if len(parts) > 1 else None
+
+
+def serve() -> None:
+    """Bind the socket and serve requests until idle timeout or stop."""
+    path = socket_path()
+    if send_request("__ping__") is not None:
+        print(f"Hook server already running on {path}", file=sys.stderr)
+        sys.exit(1)
+    with contextlib.suppress(FileNotFoundError):
+        path.unlink()
+
+    refresh_hooks()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(str(path))
+    finally:
+        os.umask(old_umask)
+    server.listen()
+    server.settimeout(IDLE_TIMEOUT)
+    # Children are reaped automatically; __stop__ arrives as SIGTERM
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except TimeoutError:
+                break
+            refresh_hooks()
+            try:
+                pid = os.fork()
+            except OSError:
+                conn.close()
+                continue
+            if pid == 0:
+                server.close()
+                serve_connection(conn)
+            conn.close()
+    finally:
+        server.close()
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+
+
+def start() -> None:
+    """Start the server in a detached background process."""
+    if send_request("__ping__") is not None:
+        print(f"Hook server already running on {socket_path()}")
+        return
+    subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), "serve"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        if send_request("__ping__") is not None:
+            print(f"Hook server started on {socket_path()}")
+            return
+        time.sleep(0.05)
+    print("Hook server did not start", file=sys.stderr)
+    sys.exit(1)
+
+
+def main() -> None:
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == "serve":
+        serve()
+    elif command == "start":
+        start()
+    elif command == "stop":
+        if send_request("__stop__") is None:
+            print("Hook server not running")
+        else:
+            print("Hook server stopped")
+    elif command == "status":
+        pid = send_request("__ping__")
+        if pid is None:
+            print("Hook server not running")
+            sys.exit(1)
+        print(f"Hook server running (pid {pid.strip()}) on {socket_path()}")
+    else:
+        print("Usage: hook-server.py start|serve|stop|status", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
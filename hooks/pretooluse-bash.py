@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""PreToolUse dispatcher: run all Bash guards in one process.
+
+Parses the hook payload once and evaluates, in order:
+1. submodule-safety cwd guard — cwd != project root and command is not a
+   `cd <root>` restore → BLOCK (exit 2, stderr)
+2. recipe-redirect routing table — matched command → permissionDecision:deny
+   JSON on stdout (exit 0)
+
+Semantics match registering both hooks separately: a cwd block wins over any
+redirect. PostToolUse cwd drift warnings stay with submodule-safety.py.
+"""
+
+import importlib.util
+import json
+import os
+import sys
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parent
+
+
+def _load(filename: str):
+    """Import a sibling hook module by filename (hyphenated, not importable)."""
+    path = HOOKS_DIR / filename
+    module_name = path.stem.replace("-", "_")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+submodule_safety = _load("submodule-safety.py")
+recipe_redirect = _load("pretooluse-recipe-redirect.py")
+
+
+def main() -> None:
+    """Entry point: read hook input once, apply cwd guard then redirects."""
+    hook_input = json.load(sys.stdin)
+    command = hook_input.get("tool_input", {}).get("command", "")
+    cwd = hook_input.get("cwd", "")
+    project_dir = os.environ.get("CLAUDE_PROJECT_DIR", "")
+
+    if cwd != project_dir:
+        error_msg = submodule_safety.pretooluse_block_message(
+            command, cwd, project_dir
+        )
+        if error_msg is not None:
+            sys.stderr.write(error_msg + "\n")
+            sys.exit(2)
+
+    result = recipe_redirect._match(command)
+    if result is not None:
+        print(json.dumps(result))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
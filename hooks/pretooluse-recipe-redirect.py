@@ -12,6 +12,13 @@ import re
 import sys
 from pathlib import Path
 
+# Compiled at import: shared with pretooluse-bash.py and the hook server
+_PYTHON_INLINE_RE = re.compile(r"python3?\s+-c\s")
+_RM_INDEX_LOCK_RE = re.compile(r"rm\s.*index\.lock")
+_PYTHON_MODULE_RE = re.compile(r"python3?\s+-m\s+(\S+)(.*)")
+_PYTHON_SCRIPT_RE = re.compile(r"python3?\s+(?!-)([\w./_-]+\.\w+)(.*)")
+_UV_RUN_RE = re.compile(r"uv\s+run\s+(.*)")
+
 
 def _deny(reason: str, agent_msg: str, user_msg: str) -> dict:
     """Construct permissionDecision:deny JSON output."""
@@ -41,7 +48,7 @@ def main() -> None:
 
 def _match_blocks(command: str) -> dict | None:
     """Hard blocks: python -c inline code, rm index.lock."""
-    if re.match(r"python3?\s+-c\s", command):
+    if _PYTHON_INLINE_RE.match(command):
         return _deny(
             "python -c is unreadable — use plans/prototypes/ instead",
             "🚫 python -c is unreadable and untestable. "
@@ -49,7 +56,7 @@ def _match_blocks(command: str) -> dict | None:
             "🚫 python -c blocked — use plans/prototypes/",
         )
 
-    if re.search(r"rm\s.*index\.lock", command):
+    if _RM_INDEX_LOCK_RE.search(command):
         return _deny(
             "Lock contention from concurrent session. Retry your git command — do not delete lock files.",
             "Lock contention from concurrent session. Retry your git command — do not delete lock files.",
@@ -61,7 +68,7 @@ def _match_blocks(command: str) -> dict | None:
 def _match_python_uv(command: str) -> dict | None:
     """Blocks for python/python3/uv invocations."""
     # python3 -m <tool>: strip prefix
-    m = re.match(r"python3?\s+-m\s+(\S+)(.*)", command)
+    m = _PYTHON_MODULE_RE.match(command)
     if m:
         tool, rest = m.group(1), m.group(2)
         return _deny(
@@ -71,7 +78,7 @@ def _match_python_uv(command: str) -> dict | None:
         )
 
     # python3 <path>: direct script invocation
-    m = re.match(r"python3?\s+(?!-)([\w./_-]+\.\w+)(.*)", command)
+    m = _PYTHON_SCRIPT_RE.match(command)
     if m:
         script, rest = m.group(1), m.group(2)
         error = _validate_script(script)
@@ -89,7 +96,7 @@ def _match_python_uv(command: str) -> dict | None:
         )
 
     # uv run <command>: unnecessary with active .venv
-    m = re.match(r"uv\s+run\s+(.*)", command)
+    m = _UV_RUN_RE.match(command)
     if m:
         rest = m.group(1)
         return _deny(
@@ -3,8 +3,11 @@ set -euo pipefail
 
 TMPDIR="${TMPDIR:-/tmp}"
 
-# Extract session_id from stdin JSON
-session_id=$(python3 -c 'import sys,json; d=json.load(sys.stdin); print(d.get("session_id",""))' 2>/dev/null || echo "")
+# Extract session_id from stdin JSON (bash match: no interpreter startup)
+hook_input=$(cat)
+session_id=""
+session_re='"session_id"[[:space:]]*:[[:space:]]*"([^"]*)"'
+[[ $hook_input =~ $session_re ]] && session_id="${BASH_REMATCH[1]}"
 
 # Write flag file (mark that SessionStart fired for this session)
 if [ -n "$session_id" ]; then
@@ -75,35 +78,22 @@ if [ -n "${CLAUDE_PLUGIN_ROOT:-}" ]; then
         fi
     fi
 
-fi
+    # 5. Optional resident hook server (opt-in): preloads the Python hooks so
+    #    hook-client.sh skips per-event interpreter startup
+    if [ "${EDIFY_HOOK_SERVER:-}" = "1" ]; then
+        python3 "$CLAUDE_PLUGIN_ROOT/hooks/hook-server.py" start > /dev/null 2>&1 || true
+    fi
 
-# Health check 1 — Dirty tree
-dirty=$(git status --porcelain 2>/dev/null)
-if [ -n "$dirty" ]; then
-    tree_status="⚠️ Dirty tree ($(echo "$dirty" | wc -l | tr -d ' ') files)"
-else
-    tree_status="✓ Clean tree"
 fi
 
-# Health check 2 — Learnings health
-learnings_status=$(python3 "${CLAUDE_PLUGIN_ROOT:-}/bin/learning-ages.py" \
-  "${CLAUDE_PROJECT_DIR:-$PWD}/agents/learnings.md" --summary 2>/dev/null \
-  || echo "⚠️ Learnings status unavailable")
-
-# Health check 3 — Stale worktrees
-stale_wt=""
-while IFS= read -r wt_path; do
-    last_ts=$(git -C "$wt_path" log -1 --format="%ct" 2>/dev/null || echo "0")
-    now=$(date +%s)
-    age_days=$(( (now - last_ts) / 86400 ))
-    if [ "$age_days" -gt 7 ]; then
-        stale_wt="$stale_wt\n  $(basename "$wt_path") (${age_days}d)"
-    fi
-done < <(git worktree list --porcelain | grep "^worktree " | awk '{print $2}' | grep -v "^$(git rev-parse --show-toplevel)$" || true)
+# Health checks — dirty tree, learnings, stale worktrees (bin/health-snapshot.py
+# reuses results across SessionStart and Stop while HEAD is unchanged)
+health=$(python3 "${CLAUDE_PLUGIN_ROOT:-}/bin/health-snapshot.py" \
+  "${CLAUDE_PROJECT_DIR:-$PWD}/agents/learnings.md" 2>/dev/null \
+  || echo "⚠️ Health check unavailable")
 
 # Build output message with literal \n (not shell newlines)
-message="Session Health:\n${tree_status}\nLearnings: ${learnings_status}"
-[ -n "$stale_wt" ] && message="$message\n⚠️ Stale worktrees:$stale_wt"
+message="Session Health:\n${health}"
 [ -n "$setup_warnings" ] && message="$message$setup_warnings"
 
 # Output JSON with systemMessage
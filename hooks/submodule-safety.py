@@ -62,20 +62,30 @@ def _is_cd_to_root(command: str, project_dir: str) -> bool:
     return bool(re.match(pattern, command))
 
 
-def handle_pretooluse(hook_input: dict, cwd: str, project_dir: str) -> None:
-    """Block commands from wrong cwd, except restore commands."""
-    command = hook_input.get('tool_input', {}).get('command', '').strip()
+def pretooluse_block_message(command: str, cwd: str, project_dir: str) -> str | None:
+    """Return block message for a command run from wrong cwd, or None to allow.
 
-    if _is_cd_to_root(command, project_dir):
-        sys.exit(0)
+    Shared with pretooluse-bash.py. Caller has already established cwd !=
+    project_dir.
+    """
+    if _is_cd_to_root(command.strip(), project_dir):
+        return None
 
     # Block all other commands from wrong cwd
-    error_msg = (
+    return (
         f"❌ Bash commands blocked: working directory is not project root.\n"
         f"Current: {cwd}\n"
         f"Run this command to restore: cd {project_dir}"
     )
 
+
+def handle_pretooluse(hook_input: dict, cwd: str, project_dir: str) -> None:
+    """Block commands from wrong cwd, except restore commands."""
+    command = hook_input.get('tool_input', {}).get('command', '')
+    error_msg = pretooluse_block_message(command, cwd, project_dir)
+    if error_msg is None:
+        sys.exit(0)
+
     # Write to stderr and exit 2 to block
     sys.stderr.write(error_msg + "\n")
     sys.exit(2)
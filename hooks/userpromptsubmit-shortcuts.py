@@ -14,23 +14,19 @@ Tier 3 - Continuation parsing (additive):
   Multi-skill chains (/skill1 and /skill2)
 
 No match: silent pass-through (exit 0, no output)
+
+Runs on every prompt: yaml and glob are imported only when a skills
+directory is re-scanned, and Tier 3 is skipped unless could_chain_skills() passes.
 """
 
-import glob
-import hashlib
+import bisect
 import json
 import os
 import re
 import sys
-import time
 from pathlib import Path
 from typing import Any
 
-try:
-    import yaml
-except ImportError:
-    yaml = None  # type: ignore
-
 
 # Tier 1: Command shortcuts (exact match)
 COMMANDS = {
@@ -194,49 +190,93 @@ CCG_PATTERN = re.compile(
     re.IGNORECASE,
 )
 
+# Tier 2: directive line ("key: value")
+DIRECTIVE_LINE_PATTERN = re.compile(r"^(\w+):\s+(.+)")
+
+# Tier 3 pre-classifier: /skill at prompt start or after whitespace — the only
+# positions _should_exclude_reference() lets through
+SKILL_REF_CANDIDATE = re.compile(r"(?<!\S)/\w")
 
-def is_line_in_fence(lines: list[str], line_idx: int) -> bool:
-    """Check if a line is inside a fenced code block.
 
-    Tracks fence state from line 0 to line_idx. Opening fence: 3+ consecutive
-    backticks or tildes at line start. Closing fence: same character, same or
-    greater count.
+def could_chain_skills(prompt: str) -> bool:
+    """Check whether Tier 3 continuation parsing can fire for prompt.
+
+    parse_continuation() needs two or more skill references. Prompts with
+    fewer candidate positions skip build_registry() (glob, stat, YAML) entirely.
     """
-    if line_idx >= len(lines):
+    if prompt.count("/") < 2:
         return False
+    candidates = SKILL_REF_CANDIDATE.finditer(prompt)
+    return next(candidates, None) is not None and next(candidates, None) is not None
+
+
+# Fence index: (lines, line start offsets, per-line in-fence flags)
+FenceIndex = tuple[list[str], list[int], list[bool]]
+
+
+def build_fence_index(prompt: str) -> FenceIndex:
+    """Index fenced code blocks in prompt with a single O(n) pass.
+
+    Opening fence: 3+ consecutive backticks or tildes at line start. Closing
+    fence: same character, same or greater count. Fence delimiter lines count
+    as fenced. Line lookups are O(1), character offset lookups O(log n) (see
+    is_pos_in_fence).
 
+    Returns:
+        (lines, line_starts, in_fence) — prompt.split("\\n"), the character
+        offset of each line, and whether each line is fenced
+    """
+    lines = prompt.split("\n")
+    line_starts: list[int] = []
+    in_fence_flags: list[bool] = []
+    offset = 0
     fence_char = None
     fence_count = 0
     in_fence = False
 
-    for i in range(line_idx + 1):
-        stripped = lines[i].strip()
+    for line in lines:
+        line_starts.append(offset)
+        offset += len(line) + 1
+        stripped = line.strip()
+        is_delimiter = False
         if stripped.startswith(("```", "~~~")):
             char = stripped[0]
-            count = 0
-            for c in stripped:
-                if c == char:
-                    count += 1
-                else:
-                    break
+            count = len(stripped) - len(stripped.lstrip(char))
             if count >= 3:
                 if not in_fence:
                     fence_char = char
                     fence_count = count
                     in_fence = True
-                    if i == line_idx:
-                        return True
+                    is_delimiter = True
                 elif char == fence_char and count >= fence_count:
-                    if i == line_idx:
-                        return True
                     fence_char = None
                     fence_count = 0
                     in_fence = False
+                    is_delimiter = True
+        in_fence_flags.append(in_fence or is_delimiter)
+
+    return lines, line_starts, in_fence_flags
+
+
+def is_pos_in_fence(fence: FenceIndex, pos: int) -> bool:
+    """Check if character offset pos falls on a fenced line."""
+    _, line_starts, in_fence = fence
+    return in_fence[bisect.bisect_right(line_starts, pos) - 1]
 
-    return in_fence
 
+def is_line_in_fence(fence: FenceIndex, line_idx: int) -> bool:
+    """Check if line line_idx is inside a fenced code block.
 
-def scan_for_directives(prompt: str) -> list[tuple[str, str]]:
+    Takes the prompt's FenceIndex (built once by build_fence_index) so that
+    per-line queries stay O(1).
+    """
+    _, _, in_fence = fence
+    return line_idx < len(in_fence) and in_fence[line_idx]
+
+
+def scan_for_directives(
+    prompt: str, fence: FenceIndex | None = None
+) -> list[tuple[str, str]]:
     """Scan prompt for all directive matches, returning each with its section
     content.
 
@@ -247,37 +287,16 @@ def scan_for_directives(prompt: str) -> list[tuple[str, str]]:
     Returns list of (directive_key, section_content) tuples in order of
     appearance.
     """
-    lines = prompt.split("\n")
-    fence_char = None
-    fence_count = 0
-    in_fence = False
+    if fence is None:
+        fence = build_fence_index(prompt)
+    lines, _, in_fence = fence
 
     # First pass: find all non-fenced directive line indices and their keys
     directive_lines: list[tuple[int, str, str]] = []  # (line_idx, key, first_value)
     for i, line in enumerate(lines):
-        stripped = line.strip()
-        if stripped.startswith(("```", "~~~")):
-            char = stripped[0]
-            count = 0
-            for c in stripped:
-                if c == char:
-                    count += 1
-                else:
-                    break
-            if count >= 3:
-                if not in_fence:
-                    fence_char = char
-                    fence_count = count
-                    in_fence = True
-                    continue
-                if char == fence_char and count >= fence_count:
-                    fence_char = None
-                    fence_count = 0
-                    in_fence = False
-                    continue
-        if in_fence:
+        if in_fence[i]:
             continue
-        match = re.match(r"^(\w+):\s+(.+)", line)
+        match = DIRECTIVE_LINE_PATTERN.match(line)
         if match:
             key = match.group(1)
             if key in DIRECTIVES:
@@ -308,7 +327,9 @@ def extract_frontmatter(skill_path: Path) -> dict[str, Any] | None:
     Returns:
         Parsed frontmatter dict, or None if no frontmatter or parse error
     """
-    if not yaml:
+    try:
+        import yaml
+    except ImportError:
         return None
 
     try:
@@ -392,6 +413,8 @@ def scan_skill_files(base_path: Path) -> list[Path]:
     Returns:
         List of SKILL.md file paths
     """
+    import glob
+
     if not base_path.exists():
         return []
 
@@ -399,149 +422,151 @@ def scan_skill_files(base_path: Path) -> list[Path]:
     return [Path(p) for p in glob.glob(pattern, recursive=True)]
 
 
-def get_cache_path(paths: list[str], project_dir: str) -> Path:
-    """Generate cache file path based on hash of skill paths and project dir.
+# Registry cache format version; bump when the cache layout changes
+REGISTRY_CACHE_VERSION = 2
+
+
+def get_cache_path(project_dir: str) -> Path:
+    """Return registry cache file path in project-local tmp/.
 
     Args:
-        paths: List of skill file paths
         project_dir: Project directory path
 
     Returns:
         Path to cache file
     """
-    # Sort paths for consistent hashing
-    sorted_paths = sorted(paths)
-
-    # Concatenate paths + project dir
-    hash_input = "".join(sorted_paths) + project_dir
-    hash_digest = hashlib.sha256(hash_input.encode("utf-8")).hexdigest()[:16]
-
     # Use project-local tmp/ per tmp-directory convention
     cache_dir = Path(project_dir) / "tmp"
     cache_dir.mkdir(parents=True, exist_ok=True)
 
-    return cache_dir / f"continuation-registry-{hash_digest}.json"
+    return cache_dir / "continuation-registry.json"
+
+
+def _stamp(path: Path) -> list[int] | None:
+    """Return [mtime_ns, inode] for path, or None if missing.
+
+    Inode catches a directory replaced wholesale (plugin reinstall) within
+    mtime granularity.
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_ino]
+
+
+def _skills_stamp(root: Path) -> list[Any] | None:
+    """Return the change stamp of a skills directory, or None if missing.
+
+    The root's stamp plus, for each skill directory (skills/<name>/), the
+    directory's and its SKILL.md's: catches skills added, removed or renamed,
+    a SKILL.md added to an existing directory, and in-place SKILL.md edits.
+    Costs one directory listing plus two stats per skill.
+    """
+    root_stamp = _stamp(root)
+    if root_stamp is None:
+        return None
+    try:
+        names = sorted(entry.name for entry in os.scandir(root) if entry.is_dir())
+    except OSError:
+        return None
+    skills = [
+        [name, _stamp(root / name), _stamp(root / name / "SKILL.md")] for name in names
+    ]
+    return [root_stamp, *skills]
 
 
 def get_cached_registry(cache_path: Path) -> dict[str, Any] | None:
-    """Load registry from cache if valid.
+    """Load registry cache data.
 
     Args:
         cache_path: Path to cache file
 
     Returns:
-        Cached registry dict if valid, None if cache invalid or missing
+        Cache dict with "config" and "roots" entries, None if missing or invalid
     """
-    if not cache_path.exists():
-        return None
-
     try:
         with open(cache_path, encoding="utf-8") as f:
             cache_data = json.load(f)
-
-        # Validate cache structure
-        if (
-            "paths" not in cache_data
-            or "registry" not in cache_data
-            or "timestamp" not in cache_data
-        ):
-            return None
-
-        cache_timestamp = cache_data["timestamp"]
-
-        # Check if any source file modified since cache
-        for path_str in cache_data["paths"]:
-            path = Path(path_str)
-            if not path.exists():
-                # Source file deleted, invalidate cache
-                return None
-
-            if path.stat().st_mtime > cache_timestamp:
-                # File modified, invalidate cache
-                return None
-
-        return cache_data["registry"]
     except Exception:
-        # Cache corrupted or unreadable
+        # Cache missing, corrupted or unreadable
         return None
 
+    if cache_data.get("version") != REGISTRY_CACHE_VERSION:
+        return None
+    if "config" not in cache_data or "roots" not in cache_data:
+        return None
+    return cache_data
+
 
-def save_registry_cache(
-    registry: dict[str, Any], paths: list[str], cache_path: Path
-) -> None:
-    """Save registry to cache.
+def save_registry_cache(cache_data: dict[str, Any], cache_path: Path) -> None:
+    """Save registry cache data.
 
     Args:
-        registry: Registry dict to cache
-        paths: List of skill file paths
+        cache_data: Cache dict with "config" and "roots" entries
         cache_path: Path to cache file
     """
     try:
-        cache_data = {"paths": paths, "registry": registry, "timestamp": time.time()}
-
         with open(cache_path, "w", encoding="utf-8") as f:
-            json.dump(cache_data, f)
+            json.dump({"version": REGISTRY_CACHE_VERSION, **cache_data}, f)
     except Exception:
         # If caching fails, continue in degraded mode
         pass
 
 
-def build_registry() -> dict[str, dict[str, Any]]:
-    """Build registry of cooperative skills from all sources.
-
-    Uses caching for performance. Cache is invalidated when skill files are modified.
+def get_skill_roots(project_dir: str) -> list[str]:
+    """List skills directories in registry precedence order.
 
-    Returns:
-        Dictionary mapping skill names to continuation metadata:
-        {
-            "design": {
-                "cooperative": True,
-                "default-exit": ["/handoff", "/commit"]
-            },
-            ...
-        }
+    Project-local skills first, then each enabled plugin's skills directory
+    (later entries override earlier ones on name collision).
     """
-    # Get project directory
-    project_dir = os.environ.get("CLAUDE_PROJECT_DIR", "")
-    if not project_dir:
-        return {}
+    roots = [str(Path(project_dir) / ".claude" / "skills")]
+    for plugin_name in get_enabled_plugins():
+        install_path = get_plugin_install_path(plugin_name, project_dir)
+        if install_path:
+            roots.append(str(Path(install_path) / "skills"))
+    return roots
 
-    project_path = Path(project_dir)
 
-    # Collect all skill file paths for cache key generation
-    all_paths: list[str] = []
-    registry: dict[str, dict[str, Any]] = {}
+def load_manifest_skills(root: Path) -> list[list[Any]] | None:
+    """Read cooperative skills from the plugin's compiled manifest.
 
-    # 1. Scan project-local skills
-    project_skills_path = project_path / ".claude" / "skills"
-    project_skill_files = scan_skill_files(project_skills_path)
-    all_paths.extend([str(p) for p in project_skill_files])
+    bin/compile-manifest.py writes .edify-manifest.json next to skills/. Used
+    only while its skills_stamp matches _skills_stamp(root); None otherwise.
+    """
+    try:
+        with open(root.parent / ".edify-manifest.json", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != 2:
+            return None
+        if manifest.get("skills_stamp") != _skills_stamp(root):
+            return None
+        return [
+            [
+                skill["name"],
+                {"cooperative": True, "default-exit": skill["default-exit"]},
+            ]
+            for skill in manifest["skills"]
+            if skill["cooperative"]
+        ]
+    except Exception:
+        return None
 
-    # 2. Scan enabled plugin skills
-    plugin_skill_files: list[Path] = []
-    enabled_plugins = get_enabled_plugins()
-    for plugin_name in enabled_plugins:
-        install_path = get_plugin_install_path(plugin_name, project_dir)
-        if not install_path:
-            continue
 
-        plugin_path = Path(install_path)
-        skills_path = plugin_path / "skills"
-        plugin_files = scan_skill_files(skills_path)
-        plugin_skill_files.extend(plugin_files)
-        all_paths.extend([str(p) for p in plugin_files])
+def scan_cooperative_skills(root: Path) -> list[list[Any]]:
+    """Walk a skills directory and collect cooperative skill entries.
 
-    # Generate cache path and check cache
-    cache_path = get_cache_path(all_paths, project_dir)
-    cached_registry = get_cached_registry(cache_path)
+    Uses the compiled plugin manifest when current (see load_manifest_skills).
 
-    if cached_registry is not None:
-        # Cache hit - return cached registry
-        return cached_registry
+    Returns:
+        List of [skill_name, metadata] pairs in scan order
+    """
+    manifest_skills = load_manifest_skills(root)
+    if manifest_skills is not None:
+        return manifest_skills
 
-    # Cache miss - build registry from scratch
-    # Process project-local skills
-    for skill_file in project_skill_files:
+    skills: list[list[Any]] = []
+    for skill_file in scan_skill_files(root):
         frontmatter = extract_frontmatter(skill_file)
         if not frontmatter:
             continue
@@ -556,35 +581,84 @@ def build_registry() -> dict[str, dict[str, Any]]:
             # Use parent directory name
             skill_name = skill_file.parent.name
 
-        registry[skill_name] = {
-            "cooperative": True,
-            "default-exit": continuation.get("default-exit", []),
-        }
+        skills.append(
+            [
+                skill_name,
+                {
+                    "cooperative": True,
+                    "default-exit": continuation.get("default-exit", []),
+                },
+            ]
+        )
+    return skills
 
-    # Process plugin skills
-    for skill_file in plugin_skill_files:
-        frontmatter = extract_frontmatter(skill_file)
-        if not frontmatter:
-            continue
 
-        continuation = frontmatter.get("continuation", {})
-        if not continuation.get("cooperative"):
-            continue
+def build_registry() -> dict[str, dict[str, Any]]:
+    """Build registry of cooperative skills from all sources.
 
-        skill_name = frontmatter.get("name")
-        if not skill_name:
-            skill_name = skill_file.parent.name
+    Cached in tmp/continuation-registry.json. A cache hit costs a listing and
+    a few stats per skills directory plus two stats for the plugin config
+    files: the plugin list is re-resolved only when settings.json or
+    installed_plugins.json changed, and a skills directory is re-walked only
+    when its stamp (see _skills_stamp) changed.
 
-        registry[skill_name] = {
-            "cooperative": True,
-            "default-exit": continuation.get("default-exit", []),
+    Returns:
+        Dictionary mapping skill names to continuation metadata:
+        {
+            "design": {
+                "cooperative": True,
+                "default-exit": ["/handoff", "/commit"]
+            },
+            ...
         }
+    """
+    # Get project directory
+    project_dir = os.environ.get("CLAUDE_PROJECT_DIR", "")
+    if not project_dir:
+        return {}
+
+    cache_path = get_cache_path(project_dir)
+    cached = get_cached_registry(cache_path) or {"config": {}, "roots": []}
+
+    # 1. Resolve skills directories (project-local, then enabled plugins)
+    claude_home = Path.home() / ".claude"
+    config = {
+        str(path): _stamp(path)
+        for path in (
+            claude_home / "settings.json",
+            claude_home / "plugins" / "installed_plugins.json",
+        )
+    }
+    if config == cached["config"]:
+        roots = [entry[0] for entry in cached["roots"]]
+    else:
+        roots = get_skill_roots(project_dir)
+
+    # 2. Re-walk only skills directories whose stamp changed
+    cached_roots = {root: (stamp, skills) for root, stamp, skills in cached["roots"]}
+    root_entries = []
+    changed = config != cached["config"]
+    for root in roots:
+        stamp = _skills_stamp(Path(root))
+        cached_root = cached_roots.get(root)
+        if cached_root is not None and cached_root[0] == stamp:
+            skills = cached_root[1]
+        else:
+            skills = scan_cooperative_skills(Path(root)) if stamp else []
+            changed = True
+        root_entries.append([root, stamp, skills])
+
+    registry: dict[str, dict[str, Any]] = {}
+    for entry in root_entries:
+        for skill_name, metadata in entry[2]:
+            registry[skill_name] = metadata
 
     # 3. Add built-in skills
     registry.update(BUILTIN_SKILLS)
 
     # Save to cache
-    save_registry_cache(registry, all_paths, cache_path)
+    if changed:
+        save_registry_cache({"config": config, "roots": root_entries}, cache_path)
 
     return registry
 
@@ -656,7 +730,7 @@ def _should_exclude_reference(prompt: str, pos: int, skill_name: str) -> bool:
 
 
 def find_skill_references(
-    prompt: str, registry: dict[str, dict[str, Any]]
+    prompt: str, registry: dict[str, dict[str, Any]], fence: FenceIndex | None = None
 ) -> list[tuple]:
     """Find all skill references in the prompt with context-aware filtering.
 
@@ -664,14 +738,18 @@ def find_skill_references(
     - XML/structured output contexts
     - Meta-discussion (prose mentions of skills)
     - File paths
+    - Fenced code blocks
 
     Args:
         prompt: User input
         registry: Skill registry mapping names to metadata
+        fence: Prebuilt fence index for prompt (built if omitted)
 
     Returns:
         List of (position, skill_name, args_start) tuples for valid invocations
     """
+    if fence is None:
+        fence = build_fence_index(prompt)
     references = []
 
     for match in re.finditer(r"/(\w+)", prompt):
@@ -684,6 +762,8 @@ def find_skill_references(
         # Context filtering
         if _should_exclude_reference(prompt, pos, skill_name):
             continue
+        if is_pos_in_fence(fence, pos):
+            continue
 
         references.append((pos, skill_name, match.end()))
 
@@ -691,7 +771,7 @@ def find_skill_references(
 
 
 def parse_continuation(
-    prompt: str, registry: dict[str, dict[str, Any]]
+    prompt: str, registry: dict[str, dict[str, Any]], fence: FenceIndex | None = None
 ) -> dict[str, Any] | None:
     """Parse prompt for multi-skill continuation chains.
 
@@ -707,7 +787,7 @@ def parse_continuation(
         }
     """
     # Find all skill references
-    references = find_skill_references(prompt, registry)
+    references = find_skill_references(prompt, registry, fence)
 
     if len(references) <= 1:
         # No skills or single skill — pass through
@@ -975,13 +1055,16 @@ def main() -> None:
     context_parts: list[str] = []
     system_parts: list[str] = []
 
+    # Fence index shared by all tiers: fenced lines never trigger shortcuts
+    fence = build_fence_index(prompt)
+
     # Tier 1: Command on its own line (first matching line wins)
-    lines = prompt.split("\n")
+    lines, _, in_fence = fence
     is_single_line = len(lines) == 1
     commands_found: list[str] = []
-    for line in lines:
+    for i, line in enumerate(lines):
         stripped = line.strip()
-        if stripped in COMMANDS:
+        if stripped in COMMANDS and not in_fence[i]:
             commands_found.append(stripped)
 
     if commands_found:
@@ -1002,7 +1085,7 @@ def main() -> None:
                 context_parts.append(f"Invoke: {task_cmd}")
 
     # Tier 2: Directive pattern — additive, all matching directives fire (D-7)
-    directive_matches = scan_for_directives(prompt)
+    directive_matches = scan_for_directives(prompt, fence) if ":" in prompt else []
     if directive_matches:
         for directive_key, _section in directive_matches:
             expansion = DIRECTIVES[directive_key]
@@ -1027,13 +1110,14 @@ def main() -> None:
         system_parts.append("Agent instructed to use claude-code-guide")
 
     # Tier 3: Continuation parsing — combines with Tier 2.5 guards
-    try:
-        registry = build_registry()
-        parsed = parse_continuation(prompt, registry)
-        if parsed:
-            context_parts.append(format_continuation_context(parsed))
-    except Exception:
-        pass
+    if could_chain_skills(prompt):
+        try:
+            registry = build_registry()
+            parsed = parse_continuation(prompt, registry, fence)
+            if parsed:
+                context_parts.append(format_continuation_context(parsed))
+        except Exception:
+            pass
 
     # Single output assembly at end
     if context_parts:
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for prepare-runbook.py parse/validate/render hot loops.
+
+Generates a TDD runbook fixture (default 200 cycles over 5 phases, with
+execution metadata, file references and creation-verb context) and times the
+stages that scan step bodies: parsing, cycle validation, file-reference
+validation, model resolution, cycle file rendering and the orchestrator plan.
+Nothing is written to disk. Memo caches are cleared between repetitions, so
+each repetition costs what one prepare run does.
+
+Usage:
+    python scripts/bench-prepare-runbook.py [--cycles N] [--repeat R] [--baseline FILE]
+
+Compare against another revision:
+    git show <rev>:bin/prepare-runbook.py > /tmp/prepare-runbook-base.py
+    python scripts/bench-prepare-runbook.py --baseline /tmp/prepare-runbook-base.py
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PHASES = 5
+
+
+def load_module(name: str, path: Path):
+    """Import a prepare-runbook.py revision (hyphenated filename)."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_fixture(cycles: int) -> str:
+    """Return a TDD runbook with the given number of cycles."""
+    per_phase = -(-cycles // PHASES)
+    parts = ["---\ntype: tdd\nmodel: sonnet\nname: bench\n---\n"]
+    parts.append(
+        "## Common Context\n\n"
+        "Stop/Error Conditions: STOP IMMEDIATELY if a regression appears.\n"
+    )
+    for n in range(cycles):
+        major, minor = n // per_phase + 1, n % per_phase + 1
+        if minor == 1:
+            parts.append(f"### Phase {major}: Phase {major} (model: sonnet)\n")
+        parts.append(
+            f"## Cycle {major}.{minor}: Behavior {n}\n\n"
+            f"**Execution Model**: {('haiku', 'sonnet', 'opus')[n % 3]}\n"
+            f"**Report Path**: `plans/bench/reports/cycle-{major}-{minor}.md`\n"
+            "**Max Turns**: 25\n\n"
+            "**RED Phase:**\n\n"
+            f"Create `tests/test_bench_{n}.py` asserting the new behavior.\n"
+            "Uses `bin/prepare-runbook.py` and `agents/decisions/notes.md`.\n\n"
+            "```python\n"
+            f"def test_behavior_{n}():\n    assert run() == {n}\n"
+            "```\n\n"
+            "**Expected failure:** AssertionError\n\n"
+            "**GREEN Phase:**\n\n"
+            f"Update `bin/learning-ages.py` so run() returns {n}.\n\n"
+            "**Stop condition:** tests pass without regressions\n"
+        )
+    return "\n".join(parts)
+
+
+def clear_caches(module) -> None:
+    """Reset per-run memo caches so a repetition starts cold."""
+    for name in ("tokenize_runbook", "_scan_step_metadata", "_scan_file_references"):
+        func = getattr(module, name, None)
+        if func is not None and hasattr(func, "cache_clear"):
+            func.cache_clear()
+
+
+def run_hot_paths(module, content: str) -> None:
+    """Run the step-scanning stages of one prepare run, in pipeline order."""
+    runbook_path = "plans/bench/runbook.md"
+    metadata, body = module.parse_frontmatter(content)
+    sections = module.extract_sections(body)
+    cycles = module.extract_cycles(body)
+    module.validate_cycle_numbering(cycles)
+    for cycle in cycles:
+        module.validate_cycle_structure(cycle, sections.get("common_context") or "")
+    module.validate_file_references(sections, cycles, runbook_path)
+    phase_models = module.extract_phase_models(body)
+    phase_preambles = module.extract_phase_preambles(body)
+    for cycle in cycles:
+        module.extract_step_metadata(cycle["content"]).get("model")
+    for cycle in cycles:
+        model = phase_models.get(cycle["major"]) or metadata.get("model")
+        module.generate_cycle_file(
+            cycle, runbook_path, model, phase_preambles.get(cycle["major"], "")
+        )
+    module.generate_default_orchestrator(
+        "bench",
+        cycles=cycles,
+        phase_models=phase_models,
+        default_model=metadata.get("model"),
+        phase_preambles=phase_preambles,
+    )
+
+
+def bench(module, content: str, repeat: int) -> float:
+    """Return the best wall time (seconds) of run_hot_paths over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        clear_caches(module)
+        with contextlib.redirect_stderr(io.StringIO()):
+            start = time.perf_counter()
+            run_hot_paths(module, content)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="bench-prepare-runbook")
+    parser.add_argument("--cycles", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--baseline", type=Path, help="prepare-runbook.py to compare")
+    args = parser.parse_args()
+
+    # File references resolve against the repository, as in a real run
+    os.chdir(REPO_ROOT)
+    content = make_fixture(args.cycles)
+    current = bench(
+        load_module("prepare_runbook", REPO_ROOT / "bin" / "prepare-runbook.py"),
+        content,
+        args.repeat,
+    )
+    print(f"Fixture: {args.cycles} cycles, {len(content) // 1024} KiB")
+    print(f"current:  {current * 1000:.1f} ms")
+    if args.baseline:
+        base = bench(
+            load_module("prepare_runbook_base", args.baseline), content, args.repeat
+        )
+        print(f"baseline: {base * 1000:.1f} ms ({base / current:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()